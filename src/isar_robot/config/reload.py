@@ -0,0 +1,157 @@
+import json
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, get_origin
+from weakref import WeakMethod
+
+from dotenv import dotenv_values
+
+from isar_robot.config.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+SettingsListener = Callable[[dict[str, Any]], None]
+
+_listeners: list[WeakMethod] = []
+_reload_lock: Lock = Lock()
+
+
+def add_settings_listener(listener: SettingsListener) -> None:
+    # Listeners are bound methods of running robots and are held weakly so that
+    # robots can be garbage collected
+    with _reload_lock:
+        _listeners.append(WeakMethod(listener))  # type: ignore[arg-type]
+
+
+def reload_settings(overrides: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rebuilds the settings with the given overrides taking precedence over the
+    environment, and applies the values that changed to the shared settings in a
+    single update. Nothing is applied if the new settings are invalid. Returns the
+    changed settings.
+    """
+    with _reload_lock:
+        new_settings: Settings = Settings(**overrides)
+        settings: Settings = get_settings()
+        changed: dict[str, Any] = {
+            name: getattr(new_settings, name)
+            for name in Settings.model_fields
+            if getattr(new_settings, name) != getattr(settings, name)
+        }
+        if not changed:
+            return changed
+
+        # Updating the instance dictionary in one call means readers see either
+        # the old or the new value of every setting
+        settings.__dict__.update(changed)
+        logger.info(f"Reloaded settings: {changed}")
+
+        listeners: list[SettingsListener] = []
+        for reference in list(_listeners):
+            listener: SettingsListener | None = reference()
+            if listener is None:
+                _listeners.remove(reference)
+            else:
+                listeners.append(listener)
+
+    # The settings have already been applied, so a failing listener is logged
+    # rather than keeping the other listeners from being notified
+    for listener in listeners:
+        try:
+            listener(changed)
+        except Exception:
+            logger.exception(f"Failed to apply reloaded settings in {listener}")
+    return changed
+
+
+def _read_overrides(path: Path) -> dict[str, Any]:
+    prefix: str = Settings.model_config.get("env_prefix", "")
+    overrides: dict[str, Any] = {}
+    for key, value in dotenv_values(path).items():
+        name: str = key.removeprefix(prefix)
+        field = Settings.model_fields.get(name)
+        if not key.startswith(prefix) or field is None or value is None:
+            continue
+        # Settings read from other variables than their own, and the reload
+        # settings themselves, can not be changed while running
+        if field.validation_alias is not None or name.startswith("SETTINGS_RELOAD"):
+            continue
+        # Complex settings are given as JSON, as for environment variables
+        if get_origin(field.annotation) in [dict, list]:
+            overrides[name] = json.loads(value)
+        else:
+            overrides[name] = value
+    return overrides
+
+
+class SettingsWatcher:
+    def __init__(self, path: Path, interval: float) -> None:
+        self.path: Path = path
+        self.interval: float = interval
+        self._last_modified: float | None = None
+        self._signal_stop: Event = Event()
+        self._thread: Thread = Thread(
+            target=self._run, name="Robot settings watcher", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._signal_stop.set()
+        self._thread.join()
+
+    def check(self) -> dict[str, Any]:
+        try:
+            last_modified: float = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logger.warning(f"Could not read settings from {self.path}: {e}")
+            return {}
+        if last_modified == self._last_modified:
+            return {}
+
+        self._last_modified = last_modified
+        try:
+            return reload_settings(_read_overrides(self.path))
+        except OSError as e:
+            # The file is read again on the next check, as making it readable does
+            # not change its modification time
+            self._last_modified = None
+            logger.warning(f"Could not read settings from {self.path}: {e}")
+            return {}
+        except ValueError as e:
+            # Invalid settings, invalid JSON and files that are not valid UTF-8
+            logger.warning(f"Ignoring invalid settings in {self.path}: {e}")
+            return {}
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception:
+                # Keep watching, as settings are only reloaded while this runs
+                logger.exception(f"Failed to reload settings from {self.path}")
+            if self._signal_stop.wait(self.interval):
+                return
+
+
+_watcher: SettingsWatcher | None = None
+
+
+def start_settings_watcher_if_enabled() -> SettingsWatcher | None:
+    global _watcher
+    settings: Settings = get_settings()
+    if not settings.SETTINGS_RELOAD_FILE or settings.SETTINGS_RELOAD_INTERVAL <= 0:
+        return None
+    with _reload_lock:
+        if _watcher is None:
+            _watcher = SettingsWatcher(
+                path=Path(settings.SETTINGS_RELOAD_FILE),
+                interval=settings.SETTINGS_RELOAD_INTERVAL,
+            )
+            _watcher.start()
+    return _watcher
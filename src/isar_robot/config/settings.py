@@ -1,27 +1,66 @@
-from importlib.resources import as_file, files
+from functools import cache
+from pathlib import Path
+from typing import Any, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    def __init__(self) -> None:
-        try:
-            source = files("isar_robot").joinpath("config").joinpath("settings.env")
-            with as_file(source) as eml:
-                env_file = eml
-        except ModuleNotFoundError:
+    def __init__(self, **values: Any) -> None:
+        env_file: Path | None = Path(__file__).with_name("settings.env")
+        if not env_file.is_file():
             env_file = None
-        super().__init__(_env_file=env_file)
+        super().__init__(_env_file=env_file, **values)
 
     MISSION_SIMULATION_TASK_DURATION: float = Field(default=5.0)
     INITIATE_MISSION_DURATION_IN_SECONDS: float = Field(default=0.1)
     SHOULD_HAVE_RANDOM_BATTERY_LEVEL: bool = Field(default=False)
+
+    # Battery rates are given in percent per second, or percent per meter moved, so
+    # that the battery level depends on elapsed time and work done rather than on
+    # how often battery telemetry is published
+    BATTERY_INITIAL_LEVEL: float = Field(default=75.0)
+    BATTERY_CHARGING_RATE: float = Field(default=0.1)
+    BATTERY_IDLE_DISCHARGE_RATE: float = Field(default=0.005)
+    BATTERY_MOTION_DISCHARGE_PER_METER: float = Field(default=0.02)
+    BATTERY_SENSOR_DISCHARGE_RATES: dict[str, float] = Field(
+        default={
+            "take_image": 0.002,
+            "take_thermal_image": 0.004,
+            "take_video": 0.004,
+            "take_thermal_video": 0.006,
+            "record_audio": 0.001,
+            "take_co2_measurement": 0.003,
+            "take_acoustic_measurement": 0.004,
+        }
+    )
     SHOULD_START_AT_HOME: bool = Field(default=False)
-    ROBOT_POSE_PUBLISH_INTERVAL: float = Field(default=1)
-    ROBOT_BATTERY_PUBLISH_INTERVAL: float = Field(default=2)
-    ROBOT_OBSTACLE_STATUS_PUBLISH_INTERVAL: float = Field(default=10)
-    ROBOT_PRESSURE_PUBLISH_INTERVAL: float = Field(default=20)
+    ROBOT_POSE_PUBLISH_INTERVAL: float = Field(default=1, gt=0)
+    ROBOT_BATTERY_PUBLISH_INTERVAL: float = Field(default=2, gt=0)
+    ROBOT_OBSTACLE_STATUS_PUBLISH_INTERVAL: float = Field(default=10, gt=0)
+    ROBOT_PRESSURE_PUBLISH_INTERVAL: float = Field(default=20, gt=0)
+
+    # Optionally, the telemetry publishers of all robots in the process are run by
+    # one shared scheduler with absolute deadlines, see scheduler.py. By default
+    # every publisher runs in its own thread and sleeps its interval between
+    # payloads, so that a stalled publisher only delays its own telemetry
+    TELEMETRY_SCHEDULER_ENABLED: bool = Field(default=False)
+    TELEMETRY_SCHEDULER_TICK: float = Field(default=0.01)
+    TELEMETRY_SCHEDULER_SLOTS: int = Field(default=1024)
+    TELEMETRY_SCHEDULER_MAX_WORKERS: int = Field(default=4)
+
+    # Number of pose, battery and pressure samples kept in the telemetry history
+    TELEMETRY_HISTORY_SIZE: int = Field(default=3600)
+
+    # Optional directory that telemetry samples and mission state transitions are
+    # recorded to as NumPy files, see recording.py. Rows are written in batches to
+    # chunk files of a fixed number of rows, and only the newest chunks of every
+    # stream are kept when a maximum number of chunks is given
+    TELEMETRY_RECORDING_DIRECTORY: str = Field(default="")
+    TELEMETRY_RECORDING_BATCH_SIZE: int = Field(default=64)
+    TELEMETRY_RECORDING_CHUNK_SIZE: int = Field(default=100_000)
+    TELEMETRY_RECORDING_MAX_CHUNKS: int = Field(default=0)
     MISSION_SIMULATION_TIME_TO_START: float = Field(default=5.0)
     MISSION_SIMULATION_TIME_TO_STOP: float = Field(default=2.0)
     SHOULD_SIMULATE_INSPECTION_CALLBACK_CRASH: bool = Field(default=False)
@@ -31,8 +70,70 @@ class Settings(BaseSettings):
     MISSION_SIMULATION_TASK_FAILURE_PROBABILITY: float = Field(default=0.0)
     MISSION_SIMULATION_RETURN_HOME_TASK_FAILURE_PROBABILITY: float = Field(default=0.0)
 
+    # Produced inspections are cached by task id so that ISAR retrying the retrieval
+    # of an inspection gets the same inspection back. The size limit is in bytes of
+    # inspection data, and a maximum of 0 entries disables the cache. The limits
+    # apply to every robot, and are kept small as retries are for recent
+    # inspections and a fleet may run many robots in one process
+    INSPECTION_CACHE_MAX_ENTRIES: int = Field(default=8)
+    INSPECTION_CACHE_MAX_BYTES: int = Field(default=8 * 1024 * 1024)
+    INSPECTION_CACHE_TIME_TO_LIVE: float = Field(default=600.0)
+
+    # Optional post-processing of image and audio inspection data in a pool of
+    # processes, to estimate the bandwidth saved by compressing media on the robot.
+    # Image recompression requires Pillow. A value of 0 leaves that property as is
+    MEDIA_PROCESSING_ENABLED: bool = Field(default=False)
+    MEDIA_PROCESSING_MAX_WORKERS: int = Field(default=2)
+    MEDIA_PROCESSING_IMAGE_QUALITY: int = Field(default=75)
+    MEDIA_PROCESSING_IMAGE_MAX_SIZE: int = Field(default=0)
+    MEDIA_PROCESSING_AUDIO_SAMPLE_RATE: int = Field(default=16000)
+    MEDIA_PROCESSING_AUDIO_SAMPLE_WIDTH: int = Field(default=0)
+
+    # Path to a JSON script of faults to inject into the robot, see faults.py
+    FAULT_INJECTION_SCRIPT: str = Field(default="")
+
+    # Optional env file with ROBOT_ prefixed settings that is watched while the robot
+    # is running. Changes are applied to running robots without a restart, and take
+    # precedence over environment variables. A reload interval of 0 disables it
+    SETTINGS_RELOAD_FILE: str = Field(default="")
+    SETTINGS_RELOAD_INTERVAL: float = Field(default=2.0)
+
+    # Opt-in sampling profiler for the robot threads, writing collapsed stacks that
+    # can be turned into flame graphs
+    PROFILER_ENABLED: bool = Field(default=False)
+    PROFILER_SAMPLE_INTERVAL: float = Field(default=0.01)
+    PROFILER_WRITE_INTERVAL: float = Field(default=10.0)
+    PROFILER_OUTPUT_FILE: str = Field(default="isar_robot_profile.folded")
+
+    # Delay added to the robot API calls ISAR polls. With "uniform" the delay is
+    # between 0 and the modifier, with "lognormal" it is drawn from a log-normal
+    # distribution with the given median per method, capped at the maximum
+    API_DELAY_MODE: Literal["none", "uniform", "lognormal"] = Field(default="none")
     # This will cause delay between 0 and 5 seconds
     MISSION_SIMULATION_API_DELAY_MODIFIER: float = Field(default=5.0)
+    API_DELAY_MEDIANS: dict[str, float] = Field(
+        default={
+            "task_status": 0.05,
+            "mission_status": 0.05,
+            "robot_status": 0.02,
+            "get_inspection": 0.5,
+        }
+    )
+    API_DELAY_SIGMA: float = Field(default=0.6)
+    API_DELAY_MAX: float = Field(default=10.0)
+
+    # Latency targets in seconds for the robot API calls, met when the given
+    # percentile of the recent call durations is within the target
+    API_LATENCY_WINDOW_SIZE: int = Field(default=10_000)
+    API_LATENCY_SLO_PERCENTILE: float = Field(default=99.0)
+    API_LATENCY_SLO_TARGETS: dict[str, float] = Field(
+        default={
+            "task_status": 0.5,
+            "mission_status": 0.5,
+            "robot_status": 0.5,
+            "get_inspection": 5.0,
+        }
+    )
 
     # Shortname of the facility the robot is operating in. Read from the ISAR
     # environment variable so the simulated robot can choose example images that
@@ -47,4 +148,14 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    # Settings are built on first use rather than at import, so that importing the
+    # robot package stays cheap
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
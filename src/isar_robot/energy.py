@@ -0,0 +1,159 @@
+import time
+from collections.abc import Callable
+from typing import overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from robot_interface.models.mission.task import TASKS
+
+from isar_robot.config.settings import settings
+
+MIN_BATTERY_LEVEL: float = 0.0
+MAX_BATTERY_LEVEL: float = 100.0
+
+
+def get_sensor_discharge_rate(task: TASKS | None) -> float:
+    # Returns the additional discharge rate in percent per second caused by the
+    # sensor used by the given task. Tasks without a sensor do not add any load
+    if task is None:
+        return 0.0
+    return settings.BATTERY_SENSOR_DISCHARGE_RATES.get(task.type.value, 0.0)
+
+
+@overload
+def _get_discharge(
+    elapsed_time: float, distance_moved: float, sensor_discharge_rate: float
+) -> float: ...
+
+
+@overload
+def _get_discharge(
+    elapsed_time: NDArray[np.float64],
+    distance_moved: NDArray[np.float64],
+    sensor_discharge_rate: NDArray[np.float64],
+) -> NDArray[np.float64]: ...
+
+
+def _get_discharge(
+    elapsed_time: float | NDArray[np.float64],
+    distance_moved: float | NDArray[np.float64],
+    sensor_discharge_rate: float | NDArray[np.float64],
+) -> float | NDArray[np.float64]:
+    # Battery percentage used over the elapsed time (s) while moving the given
+    # distance (m) and using a sensor. Every battery computation goes through here,
+    # with floats for a single robot, as the battery model of a robot is updated on
+    # every publish, or with arrays holding one element per robot for a fleet
+    return (
+        elapsed_time * (settings.BATTERY_IDLE_DISCHARGE_RATE + sensor_discharge_rate)
+        + distance_moved * settings.BATTERY_MOTION_DISCHARGE_PER_METER
+    )
+
+
+def _as_array(values: ArrayLike) -> NDArray[np.float64]:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _get_discharge_rate(
+    speed: ArrayLike, sensor_discharge_rate: ArrayLike
+) -> NDArray[np.float64]:
+    # Discharge in percent per second when moving at a constant speed (m/s)
+    return _get_discharge(
+        elapsed_time=_as_array(1.0),
+        distance_moved=_as_array(speed),
+        sensor_discharge_rate=_as_array(sensor_discharge_rate),
+    )
+
+
+def compute_battery_levels(
+    battery_levels: ArrayLike,
+    elapsed_time: ArrayLike,
+    distance_moved: ArrayLike,
+    sensor_discharge_rate: ArrayLike,
+    is_charging: ArrayLike,
+) -> NDArray[np.float64]:
+    """
+    Computes the battery level of one or more robots after the elapsed time (s).
+    All arguments are broadcast against each other, so a whole fleet can be updated
+    in a single call by passing one element per robot.
+    """
+    discharge = _get_discharge(
+        _as_array(elapsed_time),
+        _as_array(distance_moved),
+        _as_array(sensor_discharge_rate),
+    )
+    charge = _as_array(elapsed_time) * settings.BATTERY_CHARGING_RATE
+    battery_levels = np.where(
+        is_charging,
+        np.add(battery_levels, charge),
+        np.subtract(battery_levels, discharge),
+    )
+    return np.clip(battery_levels, MIN_BATTERY_LEVEL, MAX_BATTERY_LEVEL)
+
+
+def simulate_discharge(
+    battery_levels: ArrayLike,
+    speed: ArrayLike,
+    sensor_discharge_rate: ArrayLike,
+    duration: float,
+    time_step: float,
+) -> NDArray[np.float64]:
+    """
+    Simulates the discharge of a fleet of robots moving at a constant speed (m/s)
+    while using a sensor. Returns an array of shape (n_steps + 1, n_robots) with the
+    battery level of every robot at every time step, starting with the initial level.
+    """
+    battery_levels = np.atleast_1d(np.asarray(battery_levels, dtype=np.float64))
+    timestamps = np.arange(int(duration / time_step) + 1) * time_step
+    discharge_rate = _get_discharge_rate(speed, sensor_discharge_rate)
+    return np.clip(
+        battery_levels[np.newaxis, :]
+        - timestamps[:, np.newaxis] * np.atleast_1d(discharge_rate)[np.newaxis, :],
+        MIN_BATTERY_LEVEL,
+        MAX_BATTERY_LEVEL,
+    )
+
+
+def time_until_battery_level(
+    battery_levels: ArrayLike,
+    target_battery_level: float,
+    speed: ArrayLike,
+    sensor_discharge_rate: ArrayLike,
+) -> NDArray[np.float64]:
+    """
+    Returns the time in seconds until each robot reaches the target battery level
+    when moving at a constant speed (m/s) while using a sensor.
+    """
+    discharge_rate = _get_discharge_rate(speed, sensor_discharge_rate)
+    remaining = np.maximum(np.subtract(battery_levels, target_battery_level), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            remaining == 0.0, 0.0, np.divide(remaining, discharge_rate)
+        ).astype(np.float64)
+
+
+class BatteryModel:
+    def __init__(
+        self, battery_level: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.battery_level: float = battery_level
+        self.clock: Callable[[], float] = clock
+        self.last_update_time: float = clock()
+
+    def update(
+        self, distance_moved: float, sensor_discharge_rate: float, is_charging: bool
+    ) -> float:
+        # Plain float arithmetic, as broadcasting a single robot through NumPy
+        # costs more than the computation itself
+        now: float = self.clock()
+        elapsed_time: float = now - self.last_update_time
+        battery_level: float = (
+            self.battery_level + elapsed_time * settings.BATTERY_CHARGING_RATE
+            if is_charging
+            else self.battery_level
+            - _get_discharge(elapsed_time, distance_moved, sensor_discharge_rate)
+        )
+        self.battery_level = min(
+            max(battery_level, MIN_BATTERY_LEVEL), MAX_BATTERY_LEVEL
+        )
+        self.last_update_time = now
+        return self.battery_level
@@ -0,0 +1,167 @@
+"""
+Scriptable fault injection for the simulated robot. Faults are applied to the robot
+API methods ISAR calls, to the retrieval of inspection media and to the telemetry
+publishers, and are active in a window given either in seconds since the robot was
+created or as a range of call numbers for the faulted method.
+
+A fault script is a JSON list of faults, for example:
+
+    [
+        {"target": "task_status", "type": "latency", "delay": 2.0,
+         "start_time": 60, "end_time": 120, "probability": 0.5},
+        {"target": "initiate_mission", "type": "exception",
+         "start_call": 3, "end_call": 6},
+        {"target": "telemetry/pose", "type": "stall", "delay": 10.0,
+         "start_time": 30, "end_time": 31}
+    ]
+"""
+
+import logging
+import random
+import time
+from collections import Counter
+from enum import Enum
+from pathlib import Path
+from threading import Lock
+from typing import Self
+
+from pydantic import BaseModel, Field, TypeAdapter
+from robot_interface.models.exceptions.robot_exceptions import (
+    RobotCommunicationException,
+    RobotCommunicationTimeoutException,
+    RobotException,
+    RobotMissionStatusException,
+    RobotRetrieveInspectionException,
+    RobotTaskStatusException,
+    RobotTelemetryNoUpdateException,
+)
+
+from isar_robot.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+fault_exceptions: dict[str, type[RobotException]] = {
+    "initiate_mission": RobotCommunicationException,
+    "task_status": RobotTaskStatusException,
+    "mission_status": RobotMissionStatusException,
+    "robot_status": RobotCommunicationException,
+    "get_inspection": RobotRetrieveInspectionException,
+    "read_media": RobotRetrieveInspectionException,
+}
+
+
+class FaultType(str, Enum):
+    # Delays the call by the fault delay
+    Latency = "latency"
+    # Delays the call by the fault delay and then raises a timeout exception
+    Timeout = "timeout"
+    # Raises the exception ISAR expects from the faulted method
+    Exception = "exception"
+    # Blocks a telemetry publisher for the fault delay
+    Stall = "stall"
+    # Publishes burst_size copies of a telemetry message instead of one
+    Burst = "burst"
+    # Drops the telemetry message
+    Drop = "drop"
+
+
+class Fault(BaseModel):
+    # A robot method such as "task_status", "read_media" or "telemetry/<type>"
+    # where <type> is one of pose, battery, obstacle_status or pressure
+    target: str
+    type: FaultType
+    delay: float = Field(default=0.0)
+    burst_size: int = Field(default=10)
+    probability: float = Field(default=1.0)
+    start_time: float | None = Field(default=None)
+    end_time: float | None = Field(default=None)
+    start_call: int | None = Field(default=None)
+    end_call: int | None = Field(default=None)
+
+    def is_active(self, elapsed_time: float, call_number: int) -> bool:
+        if self.start_time is not None and elapsed_time < self.start_time:
+            return False
+        if self.end_time is not None and elapsed_time >= self.end_time:
+            return False
+        if self.start_call is not None and call_number < self.start_call:
+            return False
+        if self.end_call is not None and call_number >= self.end_call:
+            return False
+        return random.random() < self.probability
+
+
+class FaultInjector:
+    def __init__(self, faults: list[Fault] | None = None) -> None:
+        self.faults: list[Fault] = list(faults or [])
+        self.call_counts: Counter[str] = Counter()
+        self.start_time: float = time.monotonic()
+        self._lock: Lock = Lock()
+
+    @classmethod
+    def from_settings(cls) -> Self:
+        if not settings.FAULT_INJECTION_SCRIPT:
+            return cls()
+        return cls(load_fault_script(Path(settings.FAULT_INJECTION_SCRIPT)))
+
+    def add_fault(self, fault: Fault) -> None:
+        with self._lock:
+            self.faults = [*self.faults, fault]
+
+    def set_faults(self, faults: list[Fault]) -> None:
+        with self._lock:
+            self.faults = list(faults)
+
+    def clear(self) -> None:
+        self.set_faults([])
+
+    def active_faults(self, target: str) -> list[Fault]:
+        # Calls are only counted while faults are configured, which keeps the robot
+        # methods free of locking when fault injection is not used
+        faults: list[Fault] = self.faults
+        if not faults:
+            return []
+        with self._lock:
+            self.call_counts[target] += 1
+            call_number: int = self.call_counts[target]
+        elapsed_time: float = time.monotonic() - self.start_time
+        return [
+            fault
+            for fault in faults
+            if fault.target == target and fault.is_active(elapsed_time, call_number)
+        ]
+
+    def apply(self, target: str) -> None:
+        for fault in self.active_faults(target):
+            logger.debug(f"Injecting {fault.type.value} fault into {target}")
+            if fault.type in [FaultType.Latency, FaultType.Stall]:
+                time.sleep(fault.delay)
+            elif fault.type == FaultType.Timeout:
+                time.sleep(fault.delay)
+                raise RobotCommunicationTimeoutException(
+                    error_description=f"Injected timeout in {target}"
+                )
+            elif fault.type == FaultType.Exception:
+                exception: type[RobotException] = fault_exceptions.get(
+                    target, RobotCommunicationException
+                )
+                raise exception(error_description=f"Injected fault in {target}")
+
+    def apply_to_telemetry(self, telemetry_type: str) -> int:
+        # Returns the number of copies of the telemetry message to publish
+        copies: int = 1
+        for fault in self.active_faults(f"telemetry/{telemetry_type}"):
+            if fault.type in [FaultType.Latency, FaultType.Stall]:
+                time.sleep(fault.delay)
+            elif fault.type == FaultType.Burst:
+                copies = max(copies, fault.burst_size)
+            elif fault.type == FaultType.Drop:
+                raise RobotTelemetryNoUpdateException(
+                    error_description=f"Injected dropped {telemetry_type} telemetry"
+                )
+        return copies
+
+
+def load_fault_script(path: Path) -> list[Fault]:
+    faults: list[Fault] = TypeAdapter(list[Fault]).validate_json(path.read_bytes())
+    logger.info(f"Loaded {len(faults)} faults from {path}")
+    return faults
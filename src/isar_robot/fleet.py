@@ -0,0 +1,402 @@
+"""
+Fleets of simulated robots. A RobotFleet runs its robots as threads in the current
+process, while a ShardedFleet spreads the robots over a pool of processes, one shard
+per CPU core by default, so that the fleet is not bound by a single GIL. Telemetry
+from every shard is batched and funnelled back to the parent through one pipe per
+shard and put on the parent telemetry queue.
+"""
+
+import logging
+import multiprocessing
+import os
+import random
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Self, cast
+from uuid import uuid4
+
+from alitra import Frame, Orientation, Pose, Position
+from paho.mqtt.properties import Properties
+from robot_interface.models.exceptions.robot_exceptions import RobotException
+from robot_interface.models.mission.mission import Mission
+from robot_interface.models.mission.status import MissionStatus, TaskStatus
+from robot_interface.models.mission.task import TakeImage
+from robot_interface.telemetry.mqtt_client import props_expiry
+
+from isar_robot.config.settings import get_settings
+from isar_robot.media import MediaProcessor, get_media_processor
+from isar_robot.robotinterface import Robot
+from isar_robot.scheduler import get_telemetry_scheduler
+from isar_robot.simulation import create_simulation_executor
+
+logger = logging.getLogger(__name__)
+
+finished_task_statuses: list[TaskStatus] = [
+    TaskStatus.Successful,
+    TaskStatus.PartiallySuccessful,
+    TaskStatus.Failed,
+    TaskStatus.Cancelled,
+]
+finished_mission_statuses: list[MissionStatus] = [
+    MissionStatus.Successful,
+    MissionStatus.PartiallySuccessful,
+    MissionStatus.Failed,
+    MissionStatus.Cancelled,
+]
+
+
+@dataclass
+class MissionStatistics:
+    missions_completed: int = 0
+    inspections_retrieved: int = 0
+    api_errors: int = 0
+
+    def merge(self, other: Self) -> None:
+        self.missions_completed += other.missions_completed
+        self.inspections_retrieved += other.inspections_retrieved
+        self.api_errors += other.api_errors
+
+
+@dataclass
+class FleetReport:
+    mission_statistics: MissionStatistics = field(default_factory=MissionStatistics)
+    memory_kib: int = 0
+    telemetry_deadline_misses: int = 0
+    media_bytes_saved: int = 0
+    # Durations of the robot API calls, as tracked by the robots themselves
+    api_call_durations: dict[str, list[float]] = field(default_factory=dict)
+
+    def merge(self, other: Self) -> None:
+        self.mission_statistics.merge(other.mission_statistics)
+        self.memory_kib += other.memory_kib
+        self.telemetry_deadline_misses += other.telemetry_deadline_misses
+        self.media_bytes_saved += other.media_bytes_saved
+        self.add_api_call_durations(other.api_call_durations)
+
+    def add_api_call_durations(
+        self, api_call_durations: dict[str, list[float]]
+    ) -> None:
+        for method, durations in api_call_durations.items():
+            self.api_call_durations.setdefault(method, []).extend(durations)
+
+
+class MissionDriver:
+    """
+    Drives back-to-back missions on a robot the way ISAR does, by polling task and
+    mission status and retrieving the inspection of every successful task.
+    """
+
+    def __init__(
+        self,
+        robot: Robot,
+        mission_statistics: MissionStatistics,
+        statistics_lock: Lock,
+        n_tasks: int,
+        poll_interval: float,
+    ) -> None:
+        self.robot: Robot = robot
+        self.mission_statistics: MissionStatistics = mission_statistics
+        self.statistics_lock: Lock = statistics_lock
+        self.n_tasks: int = n_tasks
+        self.poll_interval: float = poll_interval
+        self.signal_stop: Event = Event()
+        self.thread: Thread = Thread(
+            target=self._run, name="Fleet mission driver", daemon=True
+        )
+
+    def _run(self) -> None:
+        while not self.signal_stop.is_set():
+            try:
+                self._run_mission(_create_mission(self.n_tasks))
+            except RobotException as e:
+                logger.debug(f"Robot API call failed while driving missions: {e}")
+                with self.statistics_lock:
+                    self.mission_statistics.api_errors += 1
+                self.signal_stop.wait(self.poll_interval)
+
+        try:
+            self.robot.stop()
+        except RobotException:
+            pass
+
+    def _run_mission(self, mission: Mission) -> None:
+        self.robot.initiate_mission(mission)
+        for task in mission.tasks:
+            task_status: TaskStatus = self.robot.task_status(task.id)
+            while task_status not in finished_task_statuses:
+                if self.signal_stop.wait(self.poll_interval):
+                    return
+                task_status = self.robot.task_status(task.id)
+            if task_status == TaskStatus.Successful:
+                self.robot.get_inspection(task)
+                with self.statistics_lock:
+                    self.mission_statistics.inspections_retrieved += 1
+
+        while self.robot.mission_status(mission.id) not in finished_mission_statuses:
+            if self.signal_stop.wait(self.poll_interval):
+                return
+        with self.statistics_lock:
+            self.mission_statistics.missions_completed += 1
+
+
+def _create_mission(n_tasks: int) -> Mission:
+    tasks: list[TakeImage] = []
+    for _ in range(n_tasks):
+        x, y = random.uniform(0, 100), random.uniform(0, 100)
+        tasks.append(
+            TakeImage(
+                target=Position(x=x, y=y, z=1, frame=Frame("asset")),
+                robot_pose=Pose(
+                    Position(x=x, y=y, z=0, frame=Frame("asset")),
+                    Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+                    frame=Frame("asset"),
+                ),
+            )
+        )
+    return Mission(name="Simulated fleet mission", tasks=tasks)
+
+
+def _get_memory_kib() -> int:
+    # Current resident set size, as opposed to the high-water mark in ru_maxrss
+    # which also covers everything that ran in the process before the fleet. Not
+    # measured where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages: int = int(f.read().split()[1])
+    except OSError:
+        return 0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def create_robot_identities(n_robots: int) -> list[tuple[str, str]]:
+    return [(f"Simulated robot {i}", str(uuid4())) for i in range(n_robots)]
+
+
+class RobotFleet:
+    """
+    Robots running as threads in the current process, publishing telemetry on the
+    given queue and optionally driving missions until the fleet is stopped.
+    """
+
+    def __init__(
+        self,
+        robot_identities: list[tuple[str, str]],
+        queue: Queue,
+        drive_missions: bool = False,
+        n_tasks: int = 5,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.robot_identities: list[tuple[str, str]] = robot_identities
+        self.queue: Queue = queue
+        self.drive_missions: bool = drive_missions
+        self.n_tasks: int = n_tasks
+        self.poll_interval: float = poll_interval
+        self.robots: list[Robot] = []
+        self.drivers: list[MissionDriver] = []
+        self.publisher_threads: list[Thread] = []
+        self.report: FleetReport = FleetReport()
+        self._statistics_lock: Lock = Lock()
+        self._memory_before: int = 0
+
+    def start(self) -> None:
+        self._memory_before = _get_memory_kib()
+        simulation_executor = create_simulation_executor(
+            max_workers=max(len(self.robot_identities), 1)
+        )
+        for robot_name, isar_id in self.robot_identities:
+            robot: Robot = Robot(
+                robot_name=robot_name,
+                isar_id=isar_id,
+                simulation_executor=simulation_executor,
+            )
+            publisher_threads: list[Thread] = robot.get_telemetry_publishers(
+                queue=self.queue, isar_id=isar_id, robot_name=robot_name
+            )
+            for publisher_thread in publisher_threads:
+                publisher_thread.start()
+            self.publisher_threads.extend(publisher_threads)
+            self.robots.append(robot)
+
+        if self.drive_missions:
+            self.drivers = [
+                MissionDriver(
+                    robot=robot,
+                    mission_statistics=self.report.mission_statistics,
+                    statistics_lock=self._statistics_lock,
+                    n_tasks=self.n_tasks,
+                    poll_interval=self.poll_interval,
+                )
+                for robot in self.robots
+            ]
+        for driver in self.drivers:
+            driver.thread.start()
+
+    def stop(self) -> FleetReport:
+        for driver in self.drivers:
+            driver.signal_stop.set()
+        self.report.memory_kib = max(_get_memory_kib() - self._memory_before, 0)
+        if get_settings().TELEMETRY_SCHEDULER_ENABLED:
+            self.report.telemetry_deadline_misses = (
+                get_telemetry_scheduler().statistics.deadline_misses
+            )
+        media_processor: MediaProcessor | None = get_media_processor()
+        if media_processor is not None:
+            self.report.media_bytes_saved = media_processor.statistics.bytes_saved
+        for driver in self.drivers:
+            driver.thread.join()
+        for robot in self.robots:
+            # The latency of the robot API is reported from the latency trackers of
+            # the robots, which hold the most recent calls of every method
+            self.report.add_api_call_durations(robot.latency_tracker.durations())
+            robot.shutdown()
+        for publisher_thread in self.publisher_threads:
+            publisher_thread.join()
+        return self.report
+
+
+def _drain_queue(queue: Queue, max_batch_size: int) -> list[tuple]:
+    batch: list[tuple] = []
+    while len(batch) < max_batch_size:
+        try:
+            topic, payload, qos, retain, properties = queue.get_nowait()
+        except Empty:
+            break
+        # The message expiry is the only MQTT property set on telemetry. It is sent
+        # as seconds and the properties are rebuilt in the parent process
+        expiry: int | None = (
+            getattr(properties, "MessageExpiryInterval", None) if properties else None
+        )
+        batch.append((topic, payload, qos, retain, expiry))
+    return batch
+
+
+def _send_telemetry(queue: Queue, connection: Connection, max_batch_size: int) -> None:
+    batch: list[tuple] = _drain_queue(queue, max_batch_size)
+    while batch:
+        connection.send(("telemetry", batch))
+        batch = _drain_queue(queue, max_batch_size)
+
+
+def _run_shard(
+    robot_identities: list[tuple[str, str]],
+    connection: Connection,
+    signal_stop: Any,
+    drive_missions: bool,
+    n_tasks: int,
+    poll_interval: float,
+    batch_interval: float,
+    max_batch_size: int,
+) -> None:
+    queue: Queue = Queue()
+    fleet: RobotFleet = RobotFleet(
+        robot_identities=robot_identities,
+        queue=queue,
+        drive_missions=drive_missions,
+        n_tasks=n_tasks,
+        poll_interval=poll_interval,
+    )
+    fleet.start()
+
+    while not signal_stop.wait(batch_interval):
+        _send_telemetry(queue, connection, max_batch_size)
+
+    # Telemetry published while the robots were stopping is sent before the report
+    report: FleetReport = fleet.stop()
+    _send_telemetry(queue, connection, max_batch_size)
+    connection.send(("report", report))
+    connection.close()
+
+
+class ShardedFleet:
+    """
+    Robots spread over a pool of processes. Telemetry from all shards is put on the
+    given queue in the parent process by a single forwarding thread.
+    """
+
+    def __init__(
+        self,
+        robot_identities: list[tuple[str, str]],
+        queue: Queue,
+        n_shards: int | None = None,
+        drive_missions: bool = False,
+        n_tasks: int = 5,
+        poll_interval: float = 1.0,
+        batch_interval: float = 0.05,
+        max_batch_size: int = 1000,
+    ) -> None:
+        self.queue: Queue = queue
+        self.n_shards: int = min(
+            n_shards or os.cpu_count() or 1, max(len(robot_identities), 1)
+        )
+        self.report: FleetReport = FleetReport()
+
+        # Spawn rather than fork, as forking a process that runs threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._signal_stop = self._context.Event()
+        self._connections: list[Connection] = []
+        self._senders: list[Connection] = []
+        self._processes: list[Any] = []
+        for shard_index in range(self.n_shards):
+            receiver, sender = self._context.Pipe(duplex=False)
+            self._connections.append(receiver)
+            self._senders.append(sender)
+            self._processes.append(
+                self._context.Process(
+                    target=_run_shard,
+                    args=(
+                        robot_identities[shard_index :: self.n_shards],
+                        sender,
+                        self._signal_stop,
+                        drive_missions,
+                        n_tasks,
+                        poll_interval,
+                        batch_interval,
+                        max_batch_size,
+                    ),
+                    name=f"Simulated robot fleet shard {shard_index}",
+                    daemon=True,
+                )
+            )
+        self._forwarding_thread: Thread = Thread(
+            target=self._forward_telemetry,
+            name="Simulated robot fleet telemetry forwarder",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        for process in self._processes:
+            process.start()
+        # The shards own the sending ends, closing them here lets the forwarding
+        # thread detect when a shard has exited
+        for sender in self._senders:
+            sender.close()
+        self._forwarding_thread.start()
+
+    def stop(self) -> FleetReport:
+        self._signal_stop.set()
+        self._forwarding_thread.join()
+        for process in self._processes:
+            process.join()
+        return self.report
+
+    def _forward_telemetry(self) -> None:
+        connections: list[Connection] = list(self._connections)
+        while connections:
+            for ready in wait(connections):
+                connection: Connection = cast(Connection, ready)
+                try:
+                    message_type, content = connection.recv()
+                except EOFError:
+                    connections.remove(connection)
+                    continue
+
+                if message_type == "telemetry":
+                    for topic, payload, qos, retain, expiry in content:
+                        properties: Properties | None = (
+                            props_expiry(expiry) if expiry is not None else None
+                        )
+                        self.queue.put((topic, payload, qos, retain, properties))
+                elif message_type == "report":
+                    self.report.merge(content)
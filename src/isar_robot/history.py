@@ -0,0 +1,173 @@
+import math
+import time
+from collections.abc import Callable
+from threading import Lock
+
+import numpy as np
+from numpy.typing import NDArray
+
+from isar_robot.pose import PoseSample
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of timestamped samples with one or more columns. Samples are
+    stored in preallocated arrays and the oldest sample is overwritten when full.
+    Timestamps are expected to be appended in non-decreasing order.
+    """
+
+    def __init__(self, size: int, n_columns: int) -> None:
+        self.size: int = size
+        self.n_columns: int = n_columns
+        self._timestamps: NDArray[np.float64] = np.zeros(size, dtype=np.float64)
+        self._values: NDArray[np.float64] = np.zeros(
+            (size, n_columns), dtype=np.float64
+        )
+        self._next_index: int = 0
+        self._count: int = 0
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, *values: float) -> None:
+        with self._lock:
+            self._timestamps[self._next_index] = timestamp
+            self._values[self._next_index] = values
+            self._next_index = (self._next_index + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._next_index = 0
+            self._count = 0
+
+    def segments(
+        self,
+    ) -> list[tuple[NDArray[np.float64], NDArray[np.float64]]]:
+        # Returns the stored samples in chronological order as at most two
+        # (timestamps, values) views into the buffer, without copying the data
+        with self._lock:
+            start: int = (self._next_index - self._count) % self.size
+            end: int = start + self._count
+            if end <= self.size:
+                return [(self._timestamps[start:end], self._values[start:end])]
+            return [
+                (self._timestamps[start:], self._values[start:]),
+                (self._timestamps[: end - self.size], self._values[: end - self.size]),
+            ]
+
+    def window(
+        self, start_time: float, end_time: float
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        # Returns copies of the samples with start_time <= timestamp <= end_time
+        with self._lock:
+            first: int = self._search(start_time, inclusive=False)
+            last: int = self._search(end_time, inclusive=True)
+            indices = (
+                self._next_index - self._count + np.arange(first, last)
+            ) % self.size
+            return self._timestamps[indices], self._values[indices]
+
+    def interpolate(self, timestamp: float) -> NDArray[np.float64] | None:
+        # Linearly interpolates the sample values at the given timestamp. Timestamps
+        # outside the stored range are clamped to the oldest or newest sample
+        with self._lock:
+            if self._count == 0:
+                return None
+            after: int = self._search(timestamp, inclusive=True)
+            if after == 0:
+                return self._values[self._physical_index(0)].copy()
+            if after == self._count:
+                return self._values[self._physical_index(self._count - 1)].copy()
+
+            previous: int = self._physical_index(after - 1)
+            following: int = self._physical_index(after)
+            time_span: float = float(
+                self._timestamps[following] - self._timestamps[previous]
+            )
+            if time_span <= 0:
+                return self._values[following].copy()
+            weight: float = (timestamp - float(self._timestamps[previous])) / time_span
+            return (1 - weight) * self._values[previous] + weight * self._values[
+                following
+            ]
+
+    def _physical_index(self, logical_index: int) -> int:
+        return (self._next_index - self._count + logical_index) % self.size
+
+    def _search(self, timestamp: float, inclusive: bool) -> int:
+        # Binary search over the chronological order of the samples. Returns the
+        # logical index of the first sample with a timestamp after the given one
+        # when inclusive is True, or at or after it when inclusive is False
+        low: int = 0
+        high: int = self._count
+        while low < high:
+            middle: int = (low + high) // 2
+            sample_time: float = self._timestamps[self._physical_index(middle)]
+            if sample_time < timestamp or (inclusive and sample_time == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class TelemetryHistory:
+    """
+    Recent pose, battery and pressure samples of a robot. Samples are ordered by
+    the monotonic clock, so that the order the buffers are searched in holds when
+    the wall clock is adjusted. The wall clock time of a sample is kept as its
+    first column, followed by the sample values, in the column order of PoseSample
+    for poses.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.clock: Callable[[], float] = clock
+        self.wall_clock: Callable[[], float] = wall_clock
+        self.pose: RingBuffer = RingBuffer(size=size, n_columns=8)
+        self.battery: RingBuffer = RingBuffer(size=size, n_columns=2)
+        self.pressure: RingBuffer = RingBuffer(size=size, n_columns=2)
+
+    def append_pose(self, wall_time: float, pose_sample: PoseSample) -> None:
+        self.pose.append(self.clock(), wall_time, *pose_sample)
+
+    def append_battery_level(self, wall_time: float, battery_level: float) -> None:
+        self.battery.append(self.clock(), wall_time, battery_level)
+
+    def append_pressure_level(self, wall_time: float, pressure_level: float) -> None:
+        self.pressure.append(self.clock(), wall_time, pressure_level)
+
+    def to_monotonic_time(self, wall_time: float) -> float:
+        # Maps a wall clock time to the monotonic clock with the current offset
+        # between the clocks
+        return self.clock() - (self.wall_clock() - wall_time)
+
+    def window(
+        self, ring_buffer: RingBuffer, start_wall_time: float, end_wall_time: float
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        # Returns copies of the wall clock times and values of the samples of one
+        # of the buffers of this history taken between the given wall clock times
+        _, values = ring_buffer.window(
+            self.to_monotonic_time(start_wall_time),
+            self.to_monotonic_time(end_wall_time),
+        )
+        return values[:, 0], values[:, 1:]
+
+    def interpolate_pose(self, wall_time: float) -> PoseSample | None:
+        sample: NDArray[np.float64] | None = self.pose.interpolate(
+            self.to_monotonic_time(wall_time)
+        )
+        if sample is None:
+            return None
+        pose: NDArray[np.float64] = sample[1:]
+        # Normalized linear interpolation of the orientation is accurate enough for
+        # the small rotations between consecutive pose samples
+        norm: float = math.sqrt(float(np.dot(pose[3:], pose[3:])))
+        if norm > 0:
+            pose[3:] /= norm
+        return PoseSample(*pose.tolist())
@@ -0,0 +1,124 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import Self
+
+from robot_interface.models.inspection.inspection import Inspection
+
+from isar_robot.config.settings import settings
+
+# Rough size of the metadata of an inspection, which is counted in addition to
+# its data towards the size limit of the cache
+inspection_metadata_size: int = 1024
+
+
+def get_inspection_size(inspection: Inspection) -> int:
+    data: bytes | None = getattr(inspection, "data", None)
+    return inspection_metadata_size + (len(data) if data else 0)
+
+
+@dataclass
+class CacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class InspectionCache:
+    """
+    Least recently used cache of produced inspections keyed by task id, so that
+    ISAR retrying the retrieval of an inspection gets the same inspection back
+    without it being produced again. Entries expire after the time to live and are
+    purged whenever an inspection is added, and the least recently used entries are
+    evicted when the cache holds more than the maximum number of entries or bytes.
+    A maximum of 0 entries disables the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        time_to_live: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.time_to_live: float = time_to_live
+        self.clock: Callable[[], float] = clock
+        self.size: int = 0
+        self.statistics: CacheStatistics = CacheStatistics()
+        # Task id to the inspection, its size and the time it was produced
+        self._entries: OrderedDict[str, tuple[Inspection, int, float]] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    @classmethod
+    def from_settings(cls) -> Self:
+        return cls(
+            max_entries=settings.INSPECTION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.INSPECTION_CACHE_MAX_BYTES,
+            time_to_live=settings.INSPECTION_CACHE_TIME_TO_LIVE,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, task_id: str) -> Inspection | None:
+        with self._lock:
+            entry: tuple[Inspection, int, float] | None = self._entries.get(task_id)
+            if entry is None:
+                self.statistics.misses += 1
+                return None
+            inspection, _, created_time = entry
+            if self.clock() - created_time > self.time_to_live:
+                self._remove(task_id)
+                self.statistics.expirations += 1
+                self.statistics.misses += 1
+                return None
+            self._entries.move_to_end(task_id)
+            self.statistics.hits += 1
+            return inspection
+
+    def put(self, task_id: str, inspection: Inspection) -> None:
+        size: int = get_inspection_size(inspection)
+        with self._lock:
+            if task_id in self._entries:
+                self._remove(task_id)
+            self._purge_expired()
+            if self.max_entries <= 0 or size > self.max_bytes:
+                return
+            self._entries[task_id] = (inspection, size, self.clock())
+            self.size += size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, task_id: str) -> None:
+        _, size, _ = self._entries.pop(task_id)
+        self.size -= size
+
+    def _purge_expired(self) -> None:
+        # Entries are ordered by use rather than by age, so all are checked. The
+        # cache holds few entries
+        now: float = self.clock()
+        expired: list[str] = [
+            task_id
+            for task_id, (_, _, created_time) in self._entries.items()
+            if now - created_time > self.time_to_live
+        ]
+        for task_id in expired:
+            self._remove(task_id)
+        self.statistics.expirations += len(expired)
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.size > self.max_bytes
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self.size -= size
+            self.statistics.evictions += 1
@@ -1,7 +1,6 @@
 import logging
-import os
 import random
-from datetime import UTC, datetime
+from datetime import datetime
 from pathlib import Path
 
 from robot_interface.models.exceptions.robot_exceptions import (
@@ -35,48 +34,39 @@ from robot_interface.models.mission.task import (
 )
 
 from isar_robot.config.settings import settings
+from isar_robot.media import MediaProcessor, get_media_processor
 from isar_robot.telemetry import Telemetry
 
-example_cloe_image_nls: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_image_cloe_nls.jpeg",
-)
-example_cloe_image_nls_empty: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_image_cloe_nls_empty.jpeg",
-)
-example_cloe_image_kaa: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_image_cloe_kaa.jpeg",
-)
-example_fencilla_image: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_image_fencilla.jpeg",
-)
-example_thermal_image = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_thermal_image.fff",
-)
-example_video: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)), "example_data/example_video.mp4"
-)
-example_thermal_video: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)),
-    "example_data/example_thermal_video.mp4",
-)
-example_audio: Path = Path(
-    os.path.dirname(os.path.realpath(__file__)), "example_data/example_audio.wav"
+example_data_directory: Path = Path(__file__).parent / "example_data"
+example_cloe_image_nls: Path = example_data_directory / "example_image_cloe_nls.jpeg"
+example_cloe_image_nls_empty: Path = (
+    example_data_directory / "example_image_cloe_nls_empty.jpeg"
 )
+example_cloe_image_kaa: Path = example_data_directory / "example_image_cloe_kaa.jpeg"
+example_fencilla_image: Path = example_data_directory / "example_image_fencilla.jpeg"
+example_thermal_image: Path = example_data_directory / "example_thermal_image.fff"
+example_video: Path = example_data_directory / "example_video.mp4"
+example_thermal_video: Path = example_data_directory / "example_thermal_video.mp4"
+example_audio: Path = example_data_directory / "example_audio.wav"
+
+# Example media that is post-processed when media processing is enabled, by file type
+processed_media_files: dict[Path, str] = {
+    example_cloe_image_nls: "jpg",
+    example_cloe_image_nls_empty: "jpg",
+    example_cloe_image_kaa: "jpg",
+    example_fencilla_image: "jpg",
+    example_audio: "wav",
+}
 
 logger = logging.getLogger(__name__)
 
 
-def create_image(task: TakeImage, telemetry: Telemetry) -> Image:
-    now: datetime = datetime.now(UTC)
-
+def create_image(
+    task: TakeImage, telemetry: Telemetry, capture_time: datetime
+) -> Image:
     image_metadata: ImageMetadata = ImageMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="jpg",
     )
@@ -84,17 +74,17 @@ def create_image(task: TakeImage, telemetry: Telemetry) -> Image:
     image_metadata.inspection_description = task.inspection_description
 
     filepath: Path = _select_image_filepath(task)
-    data = _read_data_from_file(filepath)
+    data = _read_media(filepath)
 
     return Image(metadata=image_metadata, id=task.id, data=data)
 
 
-def create_thermal_image(task: TakeThermalImage, telemetry: Telemetry) -> Image:
-    now: datetime = datetime.now(UTC)
-
+def create_thermal_image(
+    task: TakeThermalImage, telemetry: Telemetry, capture_time: datetime
+) -> Image:
     image_metadata: ThermalImageMetadata = ThermalImageMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="fff",
     )
@@ -107,11 +97,12 @@ def create_thermal_image(task: TakeThermalImage, telemetry: Telemetry) -> Image:
     return ThermalImage(metadata=image_metadata, id=task.id, data=data)
 
 
-def create_video(task: TakeVideo, telemetry: Telemetry) -> Video:
-    now: datetime = datetime.now(UTC)
+def create_video(
+    task: TakeVideo, telemetry: Telemetry, capture_time: datetime
+) -> Video:
     video_metadata: VideoMetadata = VideoMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="mp4",
         duration=11,
@@ -125,11 +116,12 @@ def create_video(task: TakeVideo, telemetry: Telemetry) -> Video:
     return Video(metadata=video_metadata, id=task.id, data=data)
 
 
-def create_thermal_video(task: TakeThermalVideo, telemetry: Telemetry):
-    now: datetime = datetime.now(UTC)
+def create_thermal_video(
+    task: TakeThermalVideo, telemetry: Telemetry, capture_time: datetime
+):
     thermal_video_metadata: ThermalVideoMetadata = ThermalVideoMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="mp4",
         duration=task.duration,
@@ -143,11 +135,10 @@ def create_thermal_video(task: TakeThermalVideo, telemetry: Telemetry):
     return ThermalVideo(metadata=thermal_video_metadata, id=task.id, data=data)
 
 
-def create_audio(task: RecordAudio, telemetry: Telemetry):
-    now: datetime = datetime.now(UTC)
+def create_audio(task: RecordAudio, telemetry: Telemetry, capture_time: datetime):
     audio_metadata: AudioMetadata = AudioMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="wav",
         duration=task.duration,
@@ -156,16 +147,17 @@ def create_audio(task: RecordAudio, telemetry: Telemetry):
     audio_metadata.inspection_description = task.inspection_description
 
     filepath: Path = example_audio
-    data = _read_data_from_file(filepath)
+    data = _read_media(filepath)
 
     return Audio(metadata=audio_metadata, id=task.id, data=data)
 
 
-def create_co2_measurement(task: TakeCO2Measurement, telemetry: Telemetry):
-    now: datetime = datetime.now(UTC)
+def create_co2_measurement(
+    task: TakeCO2Measurement, telemetry: Telemetry, capture_time: datetime
+):
     gas_measurement_metadata: GasMeasurementMetadata = GasMeasurementMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="not_a_file",
     )
@@ -181,12 +173,11 @@ def create_co2_measurement(task: TakeCO2Measurement, telemetry: Telemetry):
 
 
 def create_acoustic_measurement(
-    task: TakeAcousticMeasurement, telemetry: Telemetry
+    task: TakeAcousticMeasurement, telemetry: Telemetry, capture_time: datetime
 ) -> AcousticMeasurement:
-    now: datetime = datetime.now(UTC)
     metadata: AcousticMeasurementMetadata = AcousticMeasurementMetadata(
-        start_time=now,
-        robot_pose=telemetry.get_pose(),
+        start_time=capture_time,
+        robot_pose=telemetry.get_pose_at(capture_time),
         target_position=_get_target_position(task, telemetry),
         file_type="mp4",
         duration=11.0,
@@ -244,6 +235,19 @@ def _read_data_from_file(filename: Path) -> bytes:
     return data
 
 
+def _read_media(filepath: Path) -> bytes:
+    # Processed media is used when its processing has finished, so that neither
+    # reading the file nor the processing is done while producing the inspection
+    media_processor: MediaProcessor | None = get_media_processor()
+    if media_processor is not None and filepath in processed_media_files:
+        processed: bytes | None = media_processor.get_processed(
+            filepath, processed_media_files[filepath]
+        )
+        if processed is not None:
+            return processed
+    return _read_data_from_file(filepath)
+
+
 def _get_target_position(task: InspectionTask, telemetry: Telemetry):
     try:
         target_position = task.target
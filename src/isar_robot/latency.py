@@ -0,0 +1,154 @@
+"""
+Latency tracking and simulated latency for the robot API methods that ISAR polls.
+Call durations are kept per method in a bounded window and reported as percentiles
+against per-method latency targets. Optionally, delays drawn from a distribution
+are added to the calls to see how ISAR copes with a slow robot API.
+
+This module only uses the standard library, as the decorator is applied when the
+robot interface is imported.
+"""
+
+import math
+import random
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import wraps
+from threading import Lock
+from typing import Any
+
+from isar_robot.config.settings import get_settings
+
+reported_percentiles: list[float] = [50.0, 90.0, 99.0]
+
+
+def get_percentile(sorted_durations: list[float], percentile: float) -> float:
+    # Nearest rank percentile of durations sorted in ascending order
+    if not sorted_durations:
+        return 0.0
+    rank: int = math.ceil(percentile / 100 * len(sorted_durations))
+    return sorted_durations[max(rank, 1) - 1]
+
+
+@dataclass
+class MethodLatency:
+    method: str
+    calls: int
+    percentiles: dict[float, float]
+    max_duration: float
+    slo_target: float | None
+    slo_percentile: float
+    slo_violations: int
+
+    @property
+    def slo_met(self) -> bool:
+        if self.slo_target is None:
+            return True
+        return self.percentiles[self.slo_percentile] <= self.slo_target
+
+    def summary(self) -> str:
+        percentiles: str = ", ".join(
+            f"p{percentile:g} {duration * 1000:.1f} ms"
+            for percentile, duration in self.percentiles.items()
+        )
+        line: str = (
+            f"{self.method}: {self.calls} calls, {percentiles}, "
+            f"max {self.max_duration * 1000:.1f} ms"
+        )
+        if self.slo_target is not None:
+            line += (
+                f", target p{self.slo_percentile:g} {self.slo_target * 1000:.0f} ms "
+                f"{'met' if self.slo_met else 'missed'} "
+                f"({self.slo_violations} slow calls)"
+            )
+        return line
+
+
+def summarize_latency(method: str, durations: list[float]) -> MethodLatency:
+    settings = get_settings()
+    slo_percentile: float = settings.API_LATENCY_SLO_PERCENTILE
+    slo_target: float | None = settings.API_LATENCY_SLO_TARGETS.get(method)
+    sorted_durations: list[float] = sorted(durations)
+    return MethodLatency(
+        method=method,
+        calls=len(durations),
+        percentiles={
+            percentile: get_percentile(sorted_durations, percentile)
+            for percentile in sorted({*reported_percentiles, slo_percentile})
+        },
+        max_duration=sorted_durations[-1] if sorted_durations else 0.0,
+        slo_target=slo_target,
+        slo_percentile=slo_percentile,
+        slo_violations=(
+            sum(duration > slo_target for duration in durations)
+            if slo_target is not None
+            else 0
+        ),
+    )
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int) -> None:
+        self.window_size: int = window_size
+        self._durations: dict[str, deque[float]] = {}
+        self._lock: Lock = Lock()
+
+    def record(self, method: str, duration: float) -> None:
+        with self._lock:
+            durations: deque[float] | None = self._durations.get(method)
+            if durations is None:
+                durations = deque(maxlen=self.window_size)
+                self._durations[method] = durations
+            durations.append(duration)
+
+    def durations(self) -> dict[str, list[float]]:
+        with self._lock:
+            return {
+                method: list(method_durations)
+                for method, method_durations in self._durations.items()
+            }
+
+    def report(self) -> list[MethodLatency]:
+        return [
+            summarize_latency(method, method_durations)
+            for method, method_durations in sorted(self.durations().items())
+        ]
+
+    def summary(self) -> str:
+        return "\n".join(method.summary() for method in self.report())
+
+
+def get_api_delay(method: str) -> float:
+    settings = get_settings()
+    if settings.API_DELAY_MODE == "uniform":
+        return random.random() * settings.MISSION_SIMULATION_API_DELAY_MODIFIER
+    if settings.API_DELAY_MODE == "lognormal":
+        median: float | None = settings.API_DELAY_MEDIANS.get(method)
+        if not median:
+            return 0.0
+        # Log-normal delays have the long tail seen in real robot APIs
+        delay: float = random.lognormvariate(math.log(median), settings.API_DELAY_SIGMA)
+        return min(delay, settings.API_DELAY_MAX)
+    return 0.0
+
+
+def tracked_api_call(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Applies the simulated API delay to a robot method and records the duration of
+    every call, including failed ones, in the latency tracker of the robot.
+    """
+    name: str = method.__name__
+
+    @wraps(method)
+    def tracked_method(robot: Any, *args: Any, **kwargs: Any) -> Any:
+        start: float = time.perf_counter()
+        try:
+            delay: float = get_api_delay(name)
+            if delay > 0:
+                time.sleep(delay)
+            return method(robot, *args, **kwargs)
+        finally:
+            robot.latency_tracker.record(name, time.perf_counter() - start)
+
+    return tracked_method
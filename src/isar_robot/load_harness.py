@@ -0,0 +1,228 @@
+"""
+End-to-end load harness for the simulated robot. Starts a number of robots in this
+process, drains their telemetry into a counting sink standing in for the MQTT broker
+and drives missions through the same Robot methods ISAR uses.
+
+Run with: python -m isar_robot.load_harness --robots 10 --duration 60
+
+Use --shards to spread the robots over several processes, see isar_robot.fleet.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import Event, Thread
+
+from isar_robot.fleet import (
+    FleetReport,
+    MissionStatistics,
+    RobotFleet,
+    ShardedFleet,
+    create_robot_identities,
+)
+from isar_robot.latency import summarize_latency
+
+
+@dataclass
+class TopicStatistics:
+    message_count: int = 0
+    total_bytes: int = 0
+    publish_intervals: list[float] = field(default_factory=list)
+
+
+@dataclass
+class LoadTestReport:
+    n_robots: int
+    duration: float
+    topics: dict[str, TopicStatistics]
+    missions: MissionStatistics
+    max_queue_depth: int
+    mean_queue_depth: float
+    memory_per_robot_kib: float
+    telemetry_deadline_misses: int = 0
+    media_bytes_saved: int = 0
+    api_call_durations: dict[str, list[float]] = field(default_factory=dict)
+
+    @property
+    def messages_per_second(self) -> float:
+        return (
+            sum(topic.message_count for topic in self.topics.values()) / self.duration
+        )
+
+    def summary(self) -> str:
+        lines: list[str] = [
+            f"Robots: {self.n_robots}, duration: {self.duration:.1f} s",
+            f"Telemetry messages/s: {self.messages_per_second:.1f}",
+            f"Queue depth: max {self.max_queue_depth}, mean {self.mean_queue_depth:.1f}",
+            f"Memory per robot: {self.memory_per_robot_kib:.0f} KiB",
+            f"Telemetry deadline misses: {self.telemetry_deadline_misses}",
+        ]
+        for name, topic in sorted(self.topics.items()):
+            intervals: list[float] = topic.publish_intervals
+            jitter: float = statistics.pstdev(intervals) if intervals else 0.0
+            mean_interval: float = statistics.fmean(intervals) if intervals else 0.0
+            lines.append(
+                f"  {name}: {topic.message_count / self.duration:.1f} messages/s, "
+                f"{topic.total_bytes / self.duration:.0f} B/s, "
+                f"interval {mean_interval:.3f} s, jitter {jitter * 1000:.1f} ms"
+            )
+        lines.append(
+            f"Missions completed: {self.missions.missions_completed}, "
+            f"inspections retrieved: {self.missions.inspections_retrieved}, "
+            f"API errors: {self.missions.api_errors}"
+        )
+        if self.media_bytes_saved:
+            lines.append(f"Media processing saved {self.media_bytes_saved} bytes")
+        for method, durations in sorted(self.api_call_durations.items()):
+            lines.append(f"  {summarize_latency(method, durations).summary()}")
+        return "\n".join(lines)
+
+
+class CountingSink:
+    """
+    Stand-in for the MQTT broker. Drains the telemetry queue and counts messages,
+    bytes and publish intervals per telemetry type (the last part of the topic).
+    """
+
+    def __init__(self, queue: Queue) -> None:
+        self.queue: Queue = queue
+        self.topics: dict[str, TopicStatistics] = {}
+        self.max_queue_depth: int = 0
+        self._queue_depth_sum: int = 0
+        self._queue_depth_samples: int = 0
+        self._last_arrival_times: dict[str, float] = {}
+        self._signal_stop: Event = Event()
+        self._thread: Thread = Thread(
+            target=self._run, name="Load harness telemetry sink", daemon=True
+        )
+
+    @property
+    def mean_queue_depth(self) -> float:
+        if self._queue_depth_samples == 0:
+            return 0.0
+        return self._queue_depth_sum / self._queue_depth_samples
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._signal_stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._signal_stop.is_set():
+            try:
+                topic, payload, *_ = self.queue.get(timeout=0.1)
+            except Empty:
+                continue
+            self._record(topic, payload, arrival_time=time.perf_counter())
+
+    def _record(self, topic: str, payload: str, arrival_time: float) -> None:
+        queue_depth: int = self.queue.qsize()
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        self._queue_depth_sum += queue_depth
+        self._queue_depth_samples += 1
+
+        telemetry_type: str = topic.rsplit("/", 1)[-1]
+        topic_statistics: TopicStatistics = self.topics.setdefault(
+            telemetry_type, TopicStatistics()
+        )
+        topic_statistics.message_count += 1
+        topic_statistics.total_bytes += len(payload)
+
+        last_arrival_time: float | None = self._last_arrival_times.get(topic)
+        if last_arrival_time is not None:
+            topic_statistics.publish_intervals.append(arrival_time - last_arrival_time)
+        self._last_arrival_times[topic] = arrival_time
+
+
+def run_load_test(
+    n_robots: int,
+    duration: float,
+    n_tasks: int = 5,
+    poll_interval: float = 1.0,
+    drive_missions: bool = True,
+    n_shards: int = 1,
+) -> LoadTestReport:
+    queue: Queue = Queue()
+    sink: CountingSink = CountingSink(queue)
+    robot_identities: list[tuple[str, str]] = create_robot_identities(n_robots)
+
+    fleet: RobotFleet | ShardedFleet
+    if n_shards > 1:
+        fleet = ShardedFleet(
+            robot_identities=robot_identities,
+            queue=queue,
+            n_shards=n_shards,
+            drive_missions=drive_missions,
+            n_tasks=n_tasks,
+            poll_interval=poll_interval,
+        )
+    else:
+        fleet = RobotFleet(
+            robot_identities=robot_identities,
+            queue=queue,
+            drive_missions=drive_missions,
+            n_tasks=n_tasks,
+            poll_interval=poll_interval,
+        )
+
+    fleet.start()
+    sink.start()
+    start: float = time.perf_counter()
+    try:
+        time.sleep(duration)
+    finally:
+        # The robots and their publishers are stopped even if the run is
+        # interrupted, so they do not outlive the run they were measured in
+        elapsed: float = time.perf_counter() - start
+        fleet_report: FleetReport = fleet.stop()
+        sink.stop()
+
+    return LoadTestReport(
+        n_robots=n_robots,
+        duration=elapsed,
+        topics=sink.topics,
+        missions=fleet_report.mission_statistics,
+        max_queue_depth=sink.max_queue_depth,
+        mean_queue_depth=sink.mean_queue_depth,
+        memory_per_robot_kib=fleet_report.memory_kib / max(n_robots, 1),
+        telemetry_deadline_misses=fleet_report.telemetry_deadline_misses,
+        media_bytes_saved=fleet_report.media_bytes_saved,
+        api_call_durations=fleet_report.api_call_durations,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the simulated robot")
+    parser.add_argument("--robots", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--tasks-per-mission", type=int, default=5)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--telemetry-only", action="store_true")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Number of processes to spread the robots over, 0 for one per CPU core",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report: LoadTestReport = run_load_test(
+        n_robots=args.robots,
+        duration=args.duration,
+        n_tasks=args.tasks_per_mission,
+        poll_interval=args.poll_interval,
+        drive_missions=not args.telemetry_only,
+        n_shards=args.shards or os.cpu_count() or 1,
+    )
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Optional post-processing of inspection media, for estimating how much upload
+bandwidth and storage compression on the robot would save. Images are re-encoded
+as JPEG with a lower quality and optionally downscaled, which requires Pillow, and
+WAV audio is resampled and reduced in sample width.
+
+The example media is processed in a pool of processes when the processor is
+started, so that producing an inspection only looks up the processed data. Until
+the processing of a file has finished, inspections are sent with the data as read
+from disk rather than waiting for it.
+"""
+
+import io
+import logging
+import multiprocessing
+import wave
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import numpy.typing as npt
+
+from isar_robot.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_sample_types: dict[int, type[np.integer]] = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+@dataclass(frozen=True)
+class ImageProcessingConfig:
+    # JPEG quality from 1 to 95, 0 leaves images as they are
+    quality: int
+    # Maximum width and height in pixels, 0 keeps the size
+    max_size: int
+
+
+@dataclass(frozen=True)
+class AudioProcessingConfig:
+    # Sample rate in Hz, 0 keeps the sample rate
+    sample_rate: int
+    # Bytes per sample, 0 keeps the sample width
+    sample_width: int
+
+
+@dataclass(frozen=True)
+class ProcessedMedia:
+    original_size: int
+    data: bytes
+
+
+@dataclass
+class MediaProcessingStatistics:
+    inspections: int = 0
+    # Inspections sent unprocessed as the processing had not finished or failed
+    unprocessed_inspections: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+
+def recompress_image(data: bytes, config: ImageProcessingConfig) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("Install Pillow to recompress inspection images")
+        return data
+
+    if config.quality <= 0:
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        if config.max_size > 0:
+            image.thumbnail((config.max_size, config.max_size))
+        output: io.BytesIO = io.BytesIO()
+        image.save(output, format="JPEG", quality=config.quality, optimize=True)
+    return output.getvalue()
+
+
+def _to_float_samples(frames: bytes, sample_width: int) -> npt.NDArray[np.float64]:
+    samples: npt.NDArray = np.frombuffer(frames, dtype=_sample_types[sample_width])
+    if sample_width == 1:
+        # 8 bit WAV samples are unsigned
+        return (samples.astype(np.float64) - 128) / 128
+    return samples.astype(np.float64) / np.iinfo(_sample_types[sample_width]).max
+
+
+def _from_float_samples(samples: npt.NDArray[np.float64], sample_width: int) -> bytes:
+    samples = np.clip(samples, -1.0, 1.0)
+    if sample_width == 1:
+        return np.round(samples * 127 + 128).astype(np.uint8).tobytes()
+    maximum: int = np.iinfo(_sample_types[sample_width]).max
+    return np.round(samples * maximum).astype(_sample_types[sample_width]).tobytes()
+
+
+def _low_pass(
+    samples: npt.NDArray[np.float64], cutoff: float, n_taps: int = 101
+) -> npt.NDArray[np.float64]:
+    # Windowed sinc filter of every channel, with the cutoff frequency given as a
+    # fraction of the sample rate
+    n: npt.NDArray[np.float64] = np.arange(n_taps) - (n_taps - 1) / 2
+    taps: npt.NDArray[np.float64] = (
+        2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(n_taps)
+    )
+    taps /= taps.sum()
+    return np.column_stack(
+        [
+            np.convolve(samples[:, channel], taps, mode="same")
+            for channel in range(samples.shape[1])
+        ]
+    )
+
+
+def resample_audio(data: bytes, config: AudioProcessingConfig) -> bytes:
+    with wave.open(io.BytesIO(data)) as wav:
+        n_channels: int = wav.getnchannels()
+        sample_width: int = wav.getsampwidth()
+        sample_rate: int = wav.getframerate()
+        frames: bytes = wav.readframes(wav.getnframes())
+
+    output_sample_rate: int = config.sample_rate or sample_rate
+    output_sample_width: int = config.sample_width or sample_width
+    if (output_sample_rate, output_sample_width) == (sample_rate, sample_width):
+        return data
+    if sample_width not in _sample_types or output_sample_width not in _sample_types:
+        logger.warning(f"Can not resample audio with {sample_width} byte samples")
+        return data
+
+    samples = _to_float_samples(frames, sample_width).reshape(-1, n_channels)
+    if output_sample_rate < sample_rate:
+        # Frequencies above the new Nyquist frequency are removed before the
+        # samples are interpolated, as they would otherwise alias. The cutoff is
+        # set somewhat below it to leave room for the transition band of the filter
+        samples = _low_pass(samples, cutoff=0.45 * output_sample_rate / sample_rate)
+    n_frames: int = samples.shape[0]
+    duration: float = n_frames / sample_rate
+    times: npt.NDArray[np.float64] = np.arange(n_frames) / sample_rate
+    output_times: npt.NDArray[np.float64] = (
+        np.arange(int(duration * output_sample_rate)) / output_sample_rate
+    )
+    resampled = np.column_stack(
+        [
+            np.interp(output_times, times, samples[:, channel])
+            for channel in range(n_channels)
+        ]
+    )
+
+    output: io.BytesIO = io.BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(n_channels)
+        wav.setsampwidth(output_sample_width)
+        wav.setframerate(output_sample_rate)
+        wav.writeframes(_from_float_samples(resampled, output_sample_width))
+    return output.getvalue()
+
+
+def process_media_file(
+    filepath: Path,
+    file_type: str,
+    image_config: ImageProcessingConfig,
+    audio_config: AudioProcessingConfig,
+) -> ProcessedMedia:
+    # Run in the worker processes, which read the file themselves so that only the
+    # processed data is sent back
+    data: bytes = filepath.read_bytes()
+    if file_type == "jpg":
+        processed: bytes = recompress_image(data, image_config)
+    elif file_type == "wav":
+        processed = resample_audio(data, audio_config)
+    else:
+        processed = data
+    # Processing never makes the inspection data larger
+    return ProcessedMedia(
+        original_size=len(data),
+        data=processed if len(processed) < len(data) else data,
+    )
+
+
+class MediaProcessor:
+    def __init__(
+        self,
+        max_workers: int,
+        image_config: ImageProcessingConfig,
+        audio_config: AudioProcessingConfig,
+    ) -> None:
+        self.image_config: ImageProcessingConfig = image_config
+        self.audio_config: AudioProcessingConfig = audio_config
+        self.statistics: MediaProcessingStatistics = MediaProcessingStatistics()
+        # Spawn rather than fork, as forking a process that runs threads is unsafe
+        self._executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._processed: dict[Path, Future[ProcessedMedia]] = {}
+        self._lock: Lock = Lock()
+
+    def prefetch(self, filepath: Path, file_type: str) -> Future[ProcessedMedia]:
+        with self._lock:
+            future: Future[ProcessedMedia] | None = self._processed.get(filepath)
+            if future is None:
+                future = self._executor.submit(
+                    process_media_file,
+                    filepath,
+                    file_type,
+                    self.image_config,
+                    self.audio_config,
+                )
+                self._processed[filepath] = future
+        return future
+
+    def get_processed(self, filepath: Path, file_type: str) -> bytes | None:
+        """
+        Returns the processed data of the file if its processing has finished,
+        without waiting for it. Otherwise None is returned, and the caller sends the
+        data as read from disk.
+        """
+        future: Future[ProcessedMedia] = self.prefetch(filepath, file_type)
+        processed: ProcessedMedia | None = None
+        if future.done():
+            try:
+                processed = future.result()
+            except (OSError, ValueError, wave.Error, BrokenProcessPool) as e:
+                # Processing is optional, the inspection is sent as read from disk
+                logger.warning(f"Could not process {filepath.name}: {e}")
+
+        with self._lock:
+            if processed is None:
+                self.statistics.unprocessed_inspections += 1
+                return None
+            self.statistics.inspections += 1
+            self.statistics.bytes_in += processed.original_size
+            self.statistics.bytes_out += len(processed.data)
+        logger.debug(
+            f"Processed {filepath.name} from {processed.original_size} to "
+            f"{len(processed.data)} bytes"
+        )
+        return processed.data
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+
+_processor: MediaProcessor | None = None
+_processor_lock: Lock = Lock()
+
+
+def get_media_processor() -> MediaProcessor | None:
+    return _processor
+
+
+def start_media_processor_if_enabled() -> MediaProcessor | None:
+    # A single processor serves all robots in the process. The example media is
+    # processed up front so that inspections do not wait for the processing
+    global _processor
+    if not settings.MEDIA_PROCESSING_ENABLED:
+        return None
+
+    from isar_robot.inspections import processed_media_files
+
+    with _processor_lock:
+        if _processor is None:
+            _processor = MediaProcessor(
+                max_workers=settings.MEDIA_PROCESSING_MAX_WORKERS,
+                image_config=ImageProcessingConfig(
+                    quality=settings.MEDIA_PROCESSING_IMAGE_QUALITY,
+                    max_size=settings.MEDIA_PROCESSING_IMAGE_MAX_SIZE,
+                ),
+                audio_config=AudioProcessingConfig(
+                    sample_rate=settings.MEDIA_PROCESSING_AUDIO_SAMPLE_RATE,
+                    sample_width=settings.MEDIA_PROCESSING_AUDIO_SAMPLE_WIDTH,
+                ),
+            )
+            for filepath, file_type in processed_media_files.items():
+                _processor.prefetch(filepath, file_type)
+    return _processor
@@ -0,0 +1,57 @@
+import numpy as np
+import numpy.typing as npt
+from robot_interface.models.mission.status import MissionStatus, TaskStatus
+
+# Statuses are stored as their index in these lists, in one byte
+task_status_codes: list[TaskStatus] = list(TaskStatus)
+mission_status_codes: list[MissionStatus] = list(MissionStatus)
+_task_status_code: dict[TaskStatus, int] = {
+    status: code for code, status in enumerate(task_status_codes)
+}
+
+
+class TaskStatusStore:
+    """
+    Statuses of the tasks of a mission stored as one byte per task, with an index
+    from task id to task position. The index is a sorted array of the encoded task
+    ids that is searched with a binary search, which is cheaper to build and hold
+    than a dictionary for missions with many tasks.
+    """
+
+    def __init__(self, task_ids: list[str]) -> None:
+        ids: npt.NDArray[np.bytes_] = np.array(
+            [task_id.encode() for task_id in task_ids], dtype=np.bytes_
+        )
+        self._order: npt.NDArray[np.int64] = np.argsort(ids, kind="stable")
+        self._sorted_ids: npt.NDArray[np.bytes_] = ids[self._order]
+        self._codes: npt.NDArray[np.uint8] = np.full(
+            len(task_ids), _task_status_code[TaskStatus.NotStarted], dtype=np.uint8
+        )
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def index(self, task_id: str) -> int | None:
+        encoded_id: bytes = task_id.encode()
+        position: int = int(np.searchsorted(self._sorted_ids, encoded_id))
+        if position == len(self) or self._sorted_ids[position] != encoded_id:
+            return None
+        return int(self._order[position])
+
+    def get(self, index: int) -> TaskStatus:
+        return task_status_codes[self._codes[index]]
+
+    def set(self, index: int, status: TaskStatus) -> None:
+        self._codes[index] = _task_status_code[status]
+
+    def count(self, *statuses: TaskStatus) -> int:
+        counts: npt.NDArray[np.int64] = np.bincount(
+            self._codes, minlength=len(task_status_codes)
+        )
+        return int(sum(counts[_task_status_code[status]] for status in statuses))
+
+    def all(self, status: TaskStatus) -> bool:
+        return self.count(status) == len(self)
+
+    def any(self, *statuses: TaskStatus) -> bool:
+        return self.count(*statuses) > 0
@@ -0,0 +1,52 @@
+from typing import NamedTuple, Self
+
+from alitra import Frame, Orientation, Pose, Position
+
+asset_frame: Frame = Frame("asset")
+
+
+class PoseSample(NamedTuple):
+    """
+    Immutable robot pose in the asset frame, given as position (x, y, z) followed by
+    the orientation quaternion (qx, qy, qz, qw). A sample is cheap to create and can
+    be shared freely, as opposed to the mutable alitra Pose.
+    """
+
+    x: float
+    y: float
+    z: float
+    qx: float = 0.0
+    qy: float = 0.0
+    qz: float = 0.0
+    qw: float = 1.0
+
+    @classmethod
+    def from_pose(cls, pose: Pose) -> Self:
+        return cls(
+            pose.position.x,
+            pose.position.y,
+            pose.position.z,
+            pose.orientation.x,
+            pose.orientation.y,
+            pose.orientation.z,
+            pose.orientation.w,
+        )
+
+    def to_pose(self) -> Pose:
+        return Pose(
+            Position(x=self.x, y=self.y, z=self.z, frame=asset_frame),
+            Orientation(x=self.qx, y=self.qy, z=self.qz, w=self.qw, frame=asset_frame),
+            frame=asset_frame,
+        )
+
+    def moved_towards(self, target: Position, movement_percentage: float) -> Self:
+        return self._replace(
+            x=self.x + movement_percentage * (target.x - self.x),
+            y=self.y + movement_percentage * (target.y - self.y),
+            z=self.z + movement_percentage * (target.z - self.z),
+        )
+
+    def distance_to(self, other: Self) -> float:
+        return (
+            (other.x - self.x) ** 2 + (other.y - self.y) ** 2 + (other.z - self.z) ** 2
+        ) ** 0.5
@@ -0,0 +1,126 @@
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from threading import Event, Lock, Thread
+from types import FrameType
+
+from isar_robot.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Threads created by the robot are recognised by name: the telemetry publishers, the
+# mission simulation executor workers and the inspection callback handler
+robot_thread_name_prefixes: tuple[str, ...] = (
+    "ISAR Robot",
+    "Mission simulation thread",
+    "Inspection Callback Handler",
+)
+
+
+def _collapse_stack(frame: FrameType | None) -> str:
+    functions: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        functions.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(functions))
+
+
+def _get_thread_group(thread_name: str) -> str:
+    # Executor worker threads are suffixed with their index, which is dropped so that
+    # samples from all workers are merged in the flame graph
+    return thread_name.rstrip("0123456789").rstrip("_")
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the stacks of the robot threads and counts identical stacks.
+    The counts are written in the collapsed stack format used by flame graph tools,
+    one "thread;frame;frame count" line per unique stack.
+    """
+
+    def __init__(
+        self,
+        sample_interval: float,
+        output_file: Path,
+        write_interval: float,
+        thread_name_prefixes: tuple[str, ...] = robot_thread_name_prefixes,
+    ) -> None:
+        self.sample_interval: float = sample_interval
+        self.output_file: Path = output_file
+        self.write_interval: float = write_interval
+        self.thread_name_prefixes: tuple[str, ...] = thread_name_prefixes
+        self.stack_counts: Counter[str] = Counter()
+        self._signal_stop: Event = Event()
+        self._thread: Thread = Thread(
+            target=self._run, name="Robot sampling profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._signal_stop.set()
+        self._thread.join()
+        self.write()
+
+    def sample(self) -> None:
+        frames: dict[int, FrameType] = sys._current_frames()
+        for thread in threading.enumerate():
+            if not thread.name.startswith(self.thread_name_prefixes):
+                continue
+            frame: FrameType | None = frames.get(thread.ident or -1)
+            if frame is None:
+                continue
+            thread_group: str = _get_thread_group(thread.name)
+            self.stack_counts[f"{thread_group};{_collapse_stack(frame)}"] += 1
+
+    def write(self) -> None:
+        lines: list[str] = [
+            f"{stack} {count}\n" for stack, count in self.stack_counts.items()
+        ]
+        # Write to a temporary file and rename it so readers never see a partial file
+        temporary_file: Path = self.output_file.with_name(
+            self.output_file.name + ".tmp"
+        )
+        temporary_file.write_text("".join(lines))
+        os.replace(temporary_file, self.output_file)
+
+    def _run(self) -> None:
+        samples_per_write: int = max(int(self.write_interval / self.sample_interval), 1)
+        n_samples: int = 0
+        while not self._signal_stop.wait(self.sample_interval):
+            self.sample()
+            n_samples += 1
+            if n_samples % samples_per_write == 0:
+                try:
+                    self.write()
+                except OSError as e:
+                    logger.warning(
+                        f"Could not write profile to {self.output_file}: {e}"
+                    )
+
+
+_profiler: SamplingProfiler | None = None
+_profiler_lock: Lock = Lock()
+
+
+def start_profiler_if_enabled() -> SamplingProfiler | None:
+    # A single profiler samples all robots in the process. When profiling is
+    # disabled this is only a settings lookup
+    global _profiler
+    if not settings.PROFILER_ENABLED:
+        return None
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler(
+                sample_interval=settings.PROFILER_SAMPLE_INTERVAL,
+                output_file=Path(settings.PROFILER_OUTPUT_FILE),
+                write_interval=settings.PROFILER_WRITE_INTERVAL,
+            )
+            _profiler.start()
+            logger.info(f"Sampling profiler writing to {_profiler.output_file}")
+    return _profiler
@@ -0,0 +1,311 @@
+"""
+Optional recording of the telemetry samples and mission state transitions of a
+robot to columnar, append-only NumPy files for offline analysis of long runs.
+
+Every stream, such as the pose samples, is written to a sequence of chunk files
+named <stream>-<chunk number>.npy holding a structured array with one field per
+column. A chunk is preallocated and memory-mapped with room for a fixed number of
+rows, and rows are buffered and copied into it in batches. When a chunk is full a
+new one is started, and the oldest chunks are deleted when more than the maximum
+number of chunks are kept. A recording started in a directory that already holds
+chunks of a stream, such as after a restart of the robot, continues the numbering
+after the last of them. Closing a recording truncates the last chunk to the rows
+written, while rows not yet written to the chunk of a running robot have a
+timestamp of 0. Use load_recording to read a stream with those rows skipped.
+"""
+
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+from robot_interface.models.mission.status import MissionStatus, TaskStatus
+
+from isar_robot.config.settings import settings
+from isar_robot.mission_state import mission_status_codes, task_status_codes
+
+logger = logging.getLogger(__name__)
+
+pose_dtype: np.dtype = np.dtype(
+    [("timestamp", np.float64)]
+    + [(column, np.float64) for column in ["x", "y", "z", "qx", "qy", "qz", "qw"]]
+)
+battery_dtype: np.dtype = np.dtype(
+    [("timestamp", np.float64), ("battery_level", np.float64)]
+)
+pressure_dtype: np.dtype = np.dtype(
+    [("timestamp", np.float64), ("pressure_level", np.float64)]
+)
+# Statuses are stored as their index in mission_state.task_status_codes and
+# mission_state.mission_status_codes. Transitions of missions with longer ids
+# than mission_id_size bytes are not recorded
+mission_id_size: int = 128
+task_status_dtype: np.dtype = np.dtype(
+    [
+        ("timestamp", np.float64),
+        ("mission_id", f"S{mission_id_size}"),
+        ("task_index", np.int32),
+        ("status", np.uint8),
+    ]
+)
+mission_status_dtype: np.dtype = np.dtype(
+    [
+        ("timestamp", np.float64),
+        ("mission_id", f"S{mission_id_size}"),
+        ("status", np.uint8),
+    ]
+)
+
+
+class ColumnarLog:
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        dtype: np.dtype,
+        batch_size: int,
+        chunk_size: int,
+        max_chunks: int,
+    ) -> None:
+        self.directory: Path = directory
+        self.name: str = name
+        self.dtype: np.dtype = dtype
+        self.chunk_size: int = chunk_size
+        self.max_chunks: int = max_chunks
+        self._batch: npt.NDArray = np.zeros(batch_size, dtype=dtype)
+        self._batch_count: int = 0
+        self._chunk: np.memmap | None = None
+        self._chunk_count: int = 0
+        self._lock: Lock = Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Chunks of earlier recordings are kept, and count towards max_chunks
+        self._chunk_paths: list[Path] = _get_chunk_paths(directory, name)
+        self._chunk_index: int = (
+            _get_chunk_index(self._chunk_paths[-1]) if self._chunk_paths else -1
+        )
+        self._delete_oldest_chunks()
+
+    def append(self, *values: Any) -> None:
+        with self._lock:
+            self._batch[self._batch_count] = values
+            self._batch_count += 1
+            if self._batch_count == len(self._batch):
+                self._write_batch()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_batch()
+            if self._chunk is not None:
+                self._chunk.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_batch()
+            self._close_chunk()
+
+    def _write_batch(self) -> None:
+        written: int = 0
+        try:
+            while written < self._batch_count:
+                if self._chunk is None or self._chunk_count == self.chunk_size:
+                    self._rotate()
+                assert self._chunk is not None
+                n_rows: int = min(
+                    self._batch_count - written, self.chunk_size - self._chunk_count
+                )
+                self._chunk[self._chunk_count : self._chunk_count + n_rows] = (
+                    self._batch[written : written + n_rows]
+                )
+                self._chunk_count += n_rows
+                written += n_rows
+        finally:
+            # Rows that could not be written are dropped, so that a failed write
+            # does not leave the batch full
+            self._batch_count = 0
+
+    def _rotate(self) -> None:
+        self._close_chunk()
+        self._chunk_index += 1
+        path: Path = self.directory / f"{self.name}-{self._chunk_index:06d}.npy"
+        self._chunk = np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype, shape=(self.chunk_size,)
+        )
+        self._chunk_count = 0
+        self._chunk_paths.append(path)
+        self._delete_oldest_chunks()
+
+    def _delete_oldest_chunks(self) -> None:
+        while self.max_chunks > 0 and len(self._chunk_paths) > self.max_chunks:
+            self._chunk_paths.pop(0).unlink(missing_ok=True)
+
+    def _close_chunk(self) -> None:
+        chunk: np.memmap | None = self._chunk
+        if chunk is None:
+            return
+        self._chunk = None
+        chunk.flush()
+        if self._chunk_count == self.chunk_size:
+            return
+
+        # Truncate the last chunk to the rows written, replacing the file so that
+        # readers never see a partial file
+        path: Path = self._chunk_paths[-1]
+        rows: npt.NDArray = np.array(chunk[: self._chunk_count])
+        del chunk
+        if len(rows) == 0:
+            self._chunk_paths.pop().unlink(missing_ok=True)
+            return
+        temporary_path: Path = path.with_name(path.name + ".tmp")
+        with open(temporary_path, "wb") as f:
+            np.save(f, rows)
+        os.replace(temporary_path, path)
+
+
+class TelemetryRecorder:
+    def __init__(
+        self, directory: Path, batch_size: int, chunk_size: int, max_chunks: int
+    ) -> None:
+        self.directory: Path = directory
+
+        def create_log(name: str, dtype: np.dtype) -> ColumnarLog:
+            return ColumnarLog(
+                directory=directory,
+                name=name,
+                dtype=dtype,
+                batch_size=batch_size,
+                chunk_size=chunk_size,
+                max_chunks=max_chunks,
+            )
+
+        self.pose: ColumnarLog = create_log("pose", pose_dtype)
+        self.battery: ColumnarLog = create_log("battery", battery_dtype)
+        self.pressure: ColumnarLog = create_log("pressure", pressure_dtype)
+        self.task_status: ColumnarLog = create_log("task_status", task_status_dtype)
+        self.mission_status: ColumnarLog = create_log(
+            "mission_status", mission_status_dtype
+        )
+
+    @classmethod
+    def from_settings(cls, isar_id: str) -> Self | None:
+        if not settings.TELEMETRY_RECORDING_DIRECTORY:
+            return None
+        # Every robot records to its own directory
+        directory_name: str = re.sub(r"[^\w-]", "_", isar_id)
+        recorder: Self = cls(
+            directory=Path(settings.TELEMETRY_RECORDING_DIRECTORY) / directory_name,
+            batch_size=settings.TELEMETRY_RECORDING_BATCH_SIZE,
+            chunk_size=settings.TELEMETRY_RECORDING_CHUNK_SIZE,
+            max_chunks=settings.TELEMETRY_RECORDING_MAX_CHUNKS,
+        )
+        logger.info(f"Recording telemetry to {recorder.directory}")
+        return recorder
+
+    @property
+    def logs(self) -> list[ColumnarLog]:
+        return [
+            self.pose,
+            self.battery,
+            self.pressure,
+            self.task_status,
+            self.mission_status,
+        ]
+
+    def _append(self, log: ColumnarLog, *values: Any) -> None:
+        # Recording is optional, so a failure to record, such as a full disk, is
+        # logged and never interrupts the telemetry or the mission being recorded
+        try:
+            log.append(*values)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to record {log.name} to {self.directory}: {e}")
+
+    def record_pose(self, timestamp: float, pose_sample: tuple[float, ...]) -> None:
+        self._append(self.pose, timestamp, *pose_sample)
+
+    def record_battery_level(self, timestamp: float, battery_level: float) -> None:
+        self._append(self.battery, timestamp, battery_level)
+
+    def record_pressure_level(self, timestamp: float, pressure_level: float) -> None:
+        self._append(self.pressure, timestamp, pressure_level)
+
+    def _encode_mission_id(self, mission_id: str) -> bytes | None:
+        encoded_mission_id: bytes = mission_id.encode()
+        if len(encoded_mission_id) > mission_id_size:
+            logger.warning(
+                f"Not recording mission {mission_id}, as its id is longer than "
+                f"{mission_id_size} bytes"
+            )
+            return None
+        return encoded_mission_id
+
+    def record_task_status(
+        self, mission_id: str, task_index: int, status: TaskStatus
+    ) -> None:
+        encoded_mission_id: bytes | None = self._encode_mission_id(mission_id)
+        if encoded_mission_id is None:
+            return
+        self._append(
+            self.task_status,
+            time.time(),
+            encoded_mission_id,
+            task_index,
+            task_status_codes.index(status),
+        )
+
+    def record_mission_status(self, mission_id: str, status: MissionStatus) -> None:
+        encoded_mission_id: bytes | None = self._encode_mission_id(mission_id)
+        if encoded_mission_id is None:
+            return
+        self._append(
+            self.mission_status,
+            time.time(),
+            encoded_mission_id,
+            mission_status_codes.index(status),
+        )
+
+    def flush(self) -> None:
+        for log in self.logs:
+            log.flush()
+
+    def close(self) -> None:
+        for log in self.logs:
+            try:
+                log.close()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to close {log.name} in {self.directory}: {e}")
+
+
+def _get_chunk_index(path: Path) -> int:
+    return int(path.stem.rsplit("-", 1)[1])
+
+
+def _get_chunk_paths(directory: Path, name: str) -> list[Path]:
+    # Returns the chunk files of a stream in the order they were written
+    chunk_name: re.Pattern = re.compile(rf"{re.escape(name)}-\d+\.npy")
+    return sorted(
+        (
+            path
+            for path in directory.glob(f"{name}-*.npy")
+            if chunk_name.fullmatch(path.name)
+        ),
+        key=_get_chunk_index,
+    )
+
+
+def load_recording(directory: Path, name: str) -> list[npt.NDArray]:
+    # Returns the chunks of a stream in order as memory-mapped arrays, so that the
+    # stream is not read into memory. Rows are written to a chunk in order, so the
+    # rows not written yet are the ones after the first row with a timestamp of 0
+    chunks: list[npt.NDArray] = []
+    for path in _get_chunk_paths(directory, name):
+        chunk: npt.NDArray = np.load(path, mmap_mode="r")
+        unwritten: npt.NDArray = np.flatnonzero(chunk["timestamp"] == 0)
+        if len(unwritten) > 0:
+            chunk = chunk[: unwritten[0]]
+        if len(chunk) > 0:
+            chunks.append(chunk)
+    return chunks
@@ -1,10 +1,14 @@
 import logging
 import random
 import time
+import weakref
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from pathlib import Path
 from queue import Queue
-from threading import Thread
+from threading import Event, Thread
+from typing import TYPE_CHECKING, Any
 
 from alitra import Position
 from robot_interface.models.exceptions.robot_exceptions import (
@@ -27,25 +31,119 @@ from robot_interface.models.mission.task import (
 )
 from robot_interface.models.robots.media import MediaConfig
 from robot_interface.robot_interface import RobotInterface
-from robot_interface.telemetry.mqtt_client import MqttTelemetryPublisher
 
-from isar_robot import inspections, telemetry
-from isar_robot.config.settings import settings
-from isar_robot.simulation import MissionSimulation
+from isar_robot.config.settings import get_settings
+from isar_robot.latency import LatencyTracker, tracked_api_call
+
+if TYPE_CHECKING:
+    from robot_interface.telemetry.mqtt_client import MqttTelemetryPublisher
+
+    from isar_robot.faults import FaultInjector
+    from isar_robot.inspection_cache import InspectionCache
+    from isar_robot.recording import TelemetryRecorder
+    from isar_robot.simulation import MissionSimulation
+    from isar_robot.telemetry import Telemetry
+
+# The simulation, inspection and telemetry modules (and the settings they read) are
+# imported on first use so that importing this module is cheap. This keeps startup
+# fast when many short-lived simulated robots are spun up.
 
 logger = logging.getLogger(__name__)
 
 
 class Robot(RobotInterface):
-    def __init__(self, robot_name: str, isar_id: str) -> None:
+    def __init__(
+        self,
+        robot_name: str,
+        isar_id: str,
+        simulation_executor: ThreadPoolExecutor | None = None,
+    ) -> None:
         super().__init__(robot_name=robot_name, isar_id=isar_id)
 
-        self.telemetry = telemetry.Telemetry()
+        from isar_robot.config.reload import (
+            add_settings_listener,
+            start_settings_watcher_if_enabled,
+        )
+        from isar_robot.faults import FaultInjector
+        from isar_robot.inspection_cache import InspectionCache
+        from isar_robot.media import start_media_processor_if_enabled
+        from isar_robot.profiler import start_profiler_if_enabled
+        from isar_robot.recording import TelemetryRecorder
+        from isar_robot.simulation import create_simulation_executor
+        from isar_robot.telemetry import Telemetry
+
+        start_profiler_if_enabled()
+        start_media_processor_if_enabled()
+
+        # Missions are run as jobs on a long-lived executor. A fleet of robots in
+        # the same process shares one, with a worker for every robot, as a running
+        # mission occupies a worker until it finishes
+        self.simulation_executor: ThreadPoolExecutor = (
+            simulation_executor or create_simulation_executor()
+        )
+
+        # Optional recording of telemetry and mission state transitions to files
+        self.recorder: TelemetryRecorder | None = TelemetryRecorder.from_settings(
+            isar_id
+        )
+        # The recorder is closed when the robot is shut down, or otherwise when the
+        # robot is garbage collected or the process exits
+        self._close_recorder: weakref.finalize | None = (
+            weakref.finalize(self, self.recorder.close) if self.recorder else None
+        )
+        self.telemetry: Telemetry = Telemetry(recorder=self.recorder)
+        self.fault_injector: FaultInjector = FaultInjector.from_settings()
+        self.inspection_cache: InspectionCache = InspectionCache.from_settings()
+        self.latency_tracker: LatencyTracker = LatencyTracker(
+            window_size=get_settings().API_LATENCY_WINDOW_SIZE
+        )
         self.last_task_completion_time: datetime = datetime.now(UTC)
-        self.robot_is_home: bool = settings.SHOULD_START_AT_HOME
+        self.robot_is_home: bool = get_settings().SHOULD_START_AT_HOME
         self.mission_simulation: MissionSimulation | None = None
+        # Publishers are kept by the name of their interval setting so that the
+        # interval can be changed when the settings are reloaded
+        self.telemetry_publishers: dict[str, MqttTelemetryPublisher] = {}
+        self.signal_stop_telemetry: Event = Event()
+
+        add_settings_listener(self._on_settings_reloaded)
+        start_settings_watcher_if_enabled()
+
+    def _on_settings_reloaded(self, changed: dict[str, Any]) -> None:
+        from isar_robot.faults import Fault, load_fault_script
+
+        for setting, publisher in self.telemetry_publishers.items():
+            if setting in changed:
+                publisher.interval = changed[setting]
+        if "INSPECTION_CACHE_MAX_ENTRIES" in changed:
+            self.inspection_cache.max_entries = changed["INSPECTION_CACHE_MAX_ENTRIES"]
+        if "INSPECTION_CACHE_MAX_BYTES" in changed:
+            self.inspection_cache.max_bytes = changed["INSPECTION_CACHE_MAX_BYTES"]
+        if "INSPECTION_CACHE_TIME_TO_LIVE" in changed:
+            self.inspection_cache.time_to_live = changed[
+                "INSPECTION_CACHE_TIME_TO_LIVE"
+            ]
+        if "FAULT_INJECTION_SCRIPT" in changed:
+            # The new script is loaded before the active faults are replaced, so
+            # that a script that fails to load leaves the active faults in place
+            script: str = changed["FAULT_INJECTION_SCRIPT"]
+            faults: list[Fault] = load_fault_script(Path(script)) if script else []
+            self.fault_injector.set_faults(faults)
+
+    def shutdown(self) -> None:
+        # Releases the resources held by the robot, for robots that are created
+        # and discarded while the process keeps running. The telemetry publisher
+        # threads return after their current payload
+        self.signal_stop_telemetry.set()
+        if self._close_recorder:
+            self._close_recorder()
+        latency_summary: str = self.latency_tracker.summary()
+        if latency_summary:
+            logger.info(f"Robot API latency:\n{latency_summary}")
 
     def initiate_mission(self, mission: Mission) -> None:
+        from isar_robot.simulation import MissionSimulation
+
+        self.fault_injector.apply("initiate_mission")
         if (
             self.mission_simulation
             and self.mission_simulation.is_alive()
@@ -60,12 +158,14 @@ class Robot(RobotInterface):
             )
         elif self.mission_simulation:
             self.mission_simulation.join()
-        self.mission_simulation = MissionSimulation(mission)
-        self.mission_simulation.start()
+        self.mission_simulation = MissionSimulation(mission, recorder=self.recorder)
+        self.mission_simulation.start(self.simulation_executor)
         self.robot_is_home = False
         logger.info(f"Mission initiated: {mission.id}")
 
+    @tracked_api_call
     def task_status(self, task_id: str) -> TaskStatus:
+        self.fault_injector.apply("task_status")
         if not self.mission_simulation:
             raise RobotNoMissionRunningException(
                 error_description="Could not get task status as no mission is running"
@@ -74,7 +174,9 @@ class Robot(RobotInterface):
         status = self.mission_simulation.task_status(task_id)
         return status
 
+    @tracked_api_call
     def mission_status(self, mission_id):
+        self.fault_injector.apply("mission_status")
         status = self.mission_simulation.mission_status()
         if (
             status == MissionStatus.Successful
@@ -94,21 +196,54 @@ class Robot(RobotInterface):
         finally:
             self.mission_simulation = None
 
+    @tracked_api_call
     def get_inspection(self, task: InspectionTask) -> Inspection:
+        self.fault_injector.apply("get_inspection")
+        # Retries of the same task get the inspection that was produced the first
+        # time, with the same metadata and data
+        inspection: Inspection | None = self.inspection_cache.get(task.id)
+        if inspection is not None:
+            return inspection
+
+        # Reading the media from disk is part of creating the inspection, so slow or
+        # failing media reads are injected here
+        self.fault_injector.apply("read_media")
+        # The inspection is stamped with the time the task finished, and the pose
+        # the robot had then, rather than the time it is retrieved at
+        mission_simulation: MissionSimulation | None = self.mission_simulation
+        capture_time: datetime | None = (
+            mission_simulation.inspection_time(task.id) if mission_simulation else None
+        )
+        inspection = self._create_inspection(task, capture_time or datetime.now(UTC))
+        if inspection is not None:
+            self.inspection_cache.put(task.id, inspection)
+        if mission_simulation:
+            mission_simulation.release_task(task.id)
+        return inspection
+
+    def _create_inspection(
+        self, task: InspectionTask, capture_time: datetime
+    ) -> Inspection:
+        from isar_robot import inspections
+
         if type(task) is TakeImage:
-            return inspections.create_image(task, self.telemetry)
+            return inspections.create_image(task, self.telemetry, capture_time)
         elif type(task) is TakeThermalImage:
-            return inspections.create_thermal_image(task, self.telemetry)
+            return inspections.create_thermal_image(task, self.telemetry, capture_time)
         elif type(task) is TakeVideo:
-            return inspections.create_video(task, self.telemetry)
+            return inspections.create_video(task, self.telemetry, capture_time)
         elif type(task) is TakeThermalVideo:
-            return inspections.create_thermal_video(task, self.telemetry)
+            return inspections.create_thermal_video(task, self.telemetry, capture_time)
         elif type(task) is TakeCO2Measurement:
-            return inspections.create_co2_measurement(task, self.telemetry)
+            return inspections.create_co2_measurement(
+                task, self.telemetry, capture_time
+            )
         elif type(task) is TakeAcousticMeasurement:
-            return inspections.create_acoustic_measurement(task, self.telemetry)
+            return inspections.create_acoustic_measurement(
+                task, self.telemetry, capture_time
+            )
         elif type(task) is RecordAudio:
-            return inspections.create_audio(task, self.telemetry)
+            return inspections.create_audio(task, self.telemetry, capture_time)
         else:
             return None
 
@@ -116,7 +251,7 @@ class Robot(RobotInterface):
         self, callback_function: Callable[[Inspection, Mission], None]
     ) -> Thread | None:
 
-        if settings.SHOULD_SIMULATE_INSPECTION_CALLBACK_CRASH:
+        if get_settings().SHOULD_SIMULATE_INSPECTION_CALLBACK_CRASH:
             return None
 
         def inspection_handler_with_crash():
@@ -149,78 +284,152 @@ class Robot(RobotInterface):
         )
 
     def _get_battery_telemetry(self, isar_id: str, robot_name: str) -> str:
+        current_task = None
+        if self.mission_simulation:
+            current_task = self.mission_simulation.current_task()
+
         return self.telemetry.get_battery_telemetry(
-            isar_id=isar_id, robot_name=robot_name, is_home=self.robot_is_home
+            isar_id=isar_id,
+            robot_name=robot_name,
+            is_home=self.robot_is_home,
+            current_task=current_task,
         )
 
+    def _with_telemetry_faults(
+        self, telemetry_method: Callable[..., str], queue: Queue, topic: str
+    ) -> Callable[..., str]:
+        from isar_robot.scheduler import get_publish_properties
+
+        telemetry_type: str = topic.rsplit("/", 1)[-1]
+
+        def telemetry_method_with_faults(isar_id: str, robot_name: str) -> str:
+            copies: int = self.fault_injector.apply_to_telemetry(telemetry_type)
+            payload: str = telemetry_method(isar_id=isar_id, robot_name=robot_name)
+            # Burst copies are put directly on the queue, with the properties the
+            # publisher itself publishes the returned payload with
+            for _ in range(copies - 1):
+                queue.put((topic, payload, 0, False, get_publish_properties(topic)))
+            return payload
+
+        return telemetry_method_with_faults
+
+    def _get_publisher_target(
+        self, publisher: MqttTelemetryPublisher
+    ) -> Callable[[str, str], None]:
+        from isar_robot.scheduler import get_telemetry_scheduler, run_publisher
+
+        if not get_settings().TELEMETRY_SCHEDULER_ENABLED:
+
+            def run_threaded_publisher(isar_id: str, robot_name: str) -> None:
+                run_publisher(
+                    publisher, isar_id, robot_name, self.signal_stop_telemetry
+                )
+
+            return run_threaded_publisher
+        scheduler = get_telemetry_scheduler()
+
+        def run_scheduled_publisher(isar_id: str, robot_name: str) -> None:
+            scheduler.run_publisher(
+                publisher, isar_id, robot_name, self.signal_stop_telemetry
+            )
+
+        return run_scheduled_publisher
+
     def get_telemetry_publishers(
         self, queue: Queue, isar_id: str, robot_name: str
     ) -> list[Thread]:
+        from robot_interface.telemetry.mqtt_client import MqttTelemetryPublisher
+
+        settings = get_settings()
         publisher_threads: list[Thread] = []
 
+        pose_topic: str = f"isar/{isar_id}/pose"
         pose_publisher: MqttTelemetryPublisher = MqttTelemetryPublisher(
             mqtt_queue=queue,
-            telemetry_method=self._get_pose_telemetry,
-            topic=f"isar/{isar_id}/pose",
+            telemetry_method=self._with_telemetry_faults(
+                self._get_pose_telemetry, queue, pose_topic
+            ),
+            topic=pose_topic,
             interval=settings.ROBOT_POSE_PUBLISH_INTERVAL,
             retain=False,
         )
         pose_thread: Thread = Thread(
-            target=pose_publisher.run,
+            target=self._get_publisher_target(pose_publisher),
             args=[isar_id, robot_name],
             name="ISAR Robot Pose Publisher",
             daemon=True,
         )
         publisher_threads.append(pose_thread)
+        self.telemetry_publishers["ROBOT_POSE_PUBLISH_INTERVAL"] = pose_publisher
 
+        battery_topic: str = f"isar/{isar_id}/battery"
         battery_publisher: MqttTelemetryPublisher = MqttTelemetryPublisher(
             mqtt_queue=queue,
-            telemetry_method=self._get_battery_telemetry,
-            topic=f"isar/{isar_id}/battery",
+            telemetry_method=self._with_telemetry_faults(
+                self._get_battery_telemetry, queue, battery_topic
+            ),
+            topic=battery_topic,
             interval=settings.ROBOT_BATTERY_PUBLISH_INTERVAL,
             retain=False,
         )
         battery_thread: Thread = Thread(
-            target=battery_publisher.run,
+            target=self._get_publisher_target(battery_publisher),
             args=[isar_id, robot_name],
             name="ISAR Robot Battery Publisher",
             daemon=True,
         )
         publisher_threads.append(battery_thread)
+        self.telemetry_publishers["ROBOT_BATTERY_PUBLISH_INTERVAL"] = battery_publisher
 
+        obstacle_status_topic: str = f"isar/{isar_id}/obstacle_status"
         obstacle_status_publisher: MqttTelemetryPublisher = MqttTelemetryPublisher(
             mqtt_queue=queue,
-            telemetry_method=self.telemetry.get_obstacle_status_telemetry,
-            topic=f"isar/{isar_id}/obstacle_status",
+            telemetry_method=self._with_telemetry_faults(
+                self.telemetry.get_obstacle_status_telemetry,
+                queue,
+                obstacle_status_topic,
+            ),
+            topic=obstacle_status_topic,
             interval=settings.ROBOT_OBSTACLE_STATUS_PUBLISH_INTERVAL,
             retain=False,
         )
         obstacle_status_thread: Thread = Thread(
-            target=obstacle_status_publisher.run,
+            target=self._get_publisher_target(obstacle_status_publisher),
             args=[isar_id, robot_name],
             name="ISAR Robot Obstacle Status Publisher",
             daemon=True,
         )
         publisher_threads.append(obstacle_status_thread)
+        self.telemetry_publishers["ROBOT_OBSTACLE_STATUS_PUBLISH_INTERVAL"] = (
+            obstacle_status_publisher
+        )
 
+        pressure_topic: str = f"isar/{isar_id}/pressure"
         pressure_publisher: MqttTelemetryPublisher = MqttTelemetryPublisher(
             mqtt_queue=queue,
-            telemetry_method=self.telemetry.get_pressure_telemetry,
-            topic=f"isar/{isar_id}/pressure",
+            telemetry_method=self._with_telemetry_faults(
+                self.telemetry.get_pressure_telemetry, queue, pressure_topic
+            ),
+            topic=pressure_topic,
             interval=settings.ROBOT_PRESSURE_PUBLISH_INTERVAL,
             retain=False,
         )
         pressure_thread: Thread = Thread(
-            target=pressure_publisher.run,
+            target=self._get_publisher_target(pressure_publisher),
             args=[isar_id, robot_name],
             name="ISAR Robot Pressure Publisher",
             daemon=True,
         )
         publisher_threads.append(pressure_thread)
+        self.telemetry_publishers["ROBOT_PRESSURE_PUBLISH_INTERVAL"] = (
+            pressure_publisher
+        )
 
         return publisher_threads
 
+    @tracked_api_call
     def robot_status(self) -> RobotStatus:
+        self.fault_injector.apply("robot_status")
         if self.mission_simulation and not self.mission_simulation.mission_done:
             mission_status: MissionStatus = self.mission_simulation.mission_status()
             if mission_status == MissionStatus.Paused:
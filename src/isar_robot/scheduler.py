@@ -0,0 +1,299 @@
+"""
+Shared scheduling of the telemetry publishers of all robots in the process. Instead
+of one thread per publisher sleeping its interval after every payload, a single
+scheduler thread keeps the absolute deadline of every publisher in a timer wheel
+and hands due publishers to a small pool of workers. Deadlines advance by whole
+intervals, so the time spent building payloads does not accumulate as drift, and
+the first deadline of every publisher is offset by a phase so that a fleet of robots
+does not publish in bursts.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import cache
+from threading import Event, Lock, Thread
+from typing import Any
+
+from isar.config.settings import settings as isar_settings
+from paho.mqtt.properties import Properties
+from robot_interface.models.exceptions.robot_exceptions import (
+    RobotTelemetryException,
+    RobotTelemetryNoUpdateException,
+    RobotTelemetryPoseException,
+)
+from robot_interface.telemetry.mqtt_client import MqttTelemetryPublisher, props_expiry
+from robot_interface.telemetry.payloads import CloudHealthPayload
+
+from isar_robot.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio. Phases that are successive multiples of it
+# stay evenly spread over the interval however many publishers are registered
+_phase_step: float = 0.6180339887498949
+
+# Telemetry types whose messages expire, as published by MqttTelemetryPublisher.run
+expiring_telemetry_types: list[str] = ["pose", "battery", "pressure"]
+# Exceptions on which MqttTelemetryPublisher.run publishes nothing. Kept as a tuple
+# so that the except clause parses on Python versions older than 3.14
+skipped_telemetry_exceptions: tuple[type[Exception], ...] = (
+    RobotTelemetryPoseException,
+    RobotTelemetryNoUpdateException,
+)
+
+
+def get_publish_properties(
+    topic: str, properties: Properties | None = None
+) -> Properties | None:
+    if topic.rsplit("/", 1)[-1] in expiring_telemetry_types:
+        return props_expiry(isar_settings.MQTT_TELEMETRY_EXPIRY)
+    return properties
+
+
+def publish_telemetry(
+    publisher: MqttTelemetryPublisher, isar_id: str, robot_name: str
+) -> None:
+    # One iteration of MqttTelemetryPublisher.run, without the sleep
+    try:
+        payload: str = publisher.telemetry_method(
+            isar_id=isar_id, robot_name=robot_name
+        )
+        topic: str = publisher.topic
+    except skipped_telemetry_exceptions:
+        return
+    except RobotTelemetryException:
+        payload = CloudHealthPayload(
+            isar_id=isar_id, robot_name=robot_name, timestamp=datetime.now(UTC)
+        ).model_dump_json()
+        topic = f"isar/{isar_id}/cloud_health"
+
+    publisher.publish(
+        topic=topic,
+        payload=payload,
+        qos=publisher.qos,
+        retain=publisher.retain,
+        properties=get_publish_properties(topic, publisher.properties),
+    )
+
+
+def run_publisher(
+    publisher: MqttTelemetryPublisher,
+    isar_id: str,
+    robot_name: str,
+    signal_stop: Event,
+) -> None:
+    # MqttTelemetryPublisher.run in a thread of its own, which returns when the
+    # robot is shut down
+    while True:
+        publish_telemetry(publisher, isar_id, robot_name)
+        if signal_stop.wait(publisher.interval):
+            return
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel with a fixed tick. An item is kept in the slot of the tick
+    its deadline rounds up to, together with that tick, so deadlines more than one
+    revolution ahead share slots with nearer ones and are skipped until due.
+    """
+
+    def __init__(self, tick: float, n_slots: int, start_time: float) -> None:
+        self.tick: float = tick
+        self.start_time: float = start_time
+        self.current_tick: int = 0
+        self.slots: list[list[tuple[int, Any]]] = [[] for _ in range(n_slots)]
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self.slots)
+
+    def tick_time(self, tick: int) -> float:
+        return self.start_time + tick * self.tick
+
+    def add(self, item: Any, deadline: float) -> None:
+        # Deadlines in the past are due on the next tick
+        tick: int = max(
+            math.ceil((deadline - self.start_time) / self.tick), self.current_tick + 1
+        )
+        self.slots[tick % len(self.slots)].append((tick, item))
+
+    def advance(self, now: float) -> list[Any]:
+        # Returns the items due up to now. When the wheel has fallen more than a
+        # revolution behind, every slot is visited once
+        to_tick: int = math.floor((now - self.start_time) / self.tick)
+        n_ticks: int = min(to_tick - self.current_tick, len(self.slots))
+        due: list[Any] = []
+        for tick in range(self.current_tick + 1, self.current_tick + 1 + n_ticks):
+            slot: list[tuple[int, Any]] = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            due.extend(item for item_tick, item in slot if item_tick <= to_tick)
+            slot[:] = [entry for entry in slot if entry[0] > to_tick]
+        self.current_tick = max(self.current_tick, to_tick)
+        return due
+
+
+@dataclass
+class SchedulerStatistics:
+    publishes: int = 0
+    # Periods in which a publisher did not publish, either because the previous
+    # payload was still being built or because the scheduler fell behind
+    deadline_misses: int = 0
+    total_lateness: float = 0.0
+    max_lateness: float = 0.0
+
+    @property
+    def mean_lateness(self) -> float:
+        if self.publishes == 0:
+            return 0.0
+        return self.total_lateness / self.publishes
+
+
+class ScheduledPublisher:
+    def __init__(
+        self, publisher: MqttTelemetryPublisher, isar_id: str, robot_name: str
+    ) -> None:
+        self.publisher: MqttTelemetryPublisher = publisher
+        self.isar_id: str = isar_id
+        self.robot_name: str = robot_name
+        self.deadline: float = 0.0
+        self.running: bool = False
+        self.cancelled: Event = Event()
+
+    def publish(self) -> None:
+        publish_telemetry(self.publisher, self.isar_id, self.robot_name)
+
+
+class TelemetryScheduler:
+    def __init__(
+        self,
+        tick: float,
+        n_slots: int,
+        max_workers: int,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self.clock: Callable[[], float] = clock or time.monotonic
+        self.wheel: TimerWheel = TimerWheel(
+            tick=tick, n_slots=n_slots, start_time=self.clock()
+        )
+        self.statistics: SchedulerStatistics = SchedulerStatistics()
+        self._n_registered: int = 0
+        self._lock: Lock = Lock()
+        self._signal_stop: Event = Event()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ISAR Robot telemetry worker"
+        )
+        self._thread: Thread = Thread(
+            target=self._run, name="ISAR Robot telemetry scheduler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._signal_stop.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def schedule(
+        self, publisher: MqttTelemetryPublisher, isar_id: str, robot_name: str
+    ) -> ScheduledPublisher:
+        if publisher.interval <= 0:
+            raise ValueError(
+                f"Publisher interval must be positive, got {publisher.interval}"
+            )
+        scheduled: ScheduledPublisher = ScheduledPublisher(
+            publisher, isar_id, robot_name
+        )
+        with self._lock:
+            phase: float = (self._n_registered * _phase_step) % 1.0
+            self._n_registered += 1
+            scheduled.deadline = self.clock() + phase * publisher.interval
+            self.wheel.add(scheduled, scheduled.deadline)
+        return scheduled
+
+    def cancel(self, scheduled: ScheduledPublisher) -> None:
+        # The publisher is dropped from the wheel when it is next due
+        scheduled.cancelled.set()
+
+    def run_publisher(
+        self,
+        publisher: MqttTelemetryPublisher,
+        isar_id: str,
+        robot_name: str,
+        signal_stop: Event,
+    ) -> None:
+        # Replacement for MqttTelemetryPublisher.run that blocks until the robot is
+        # shut down, so that the thread ISAR starts stays alive
+        scheduled: ScheduledPublisher = self.schedule(publisher, isar_id, robot_name)
+        signal_stop.wait()
+        self.cancel(scheduled)
+
+    def dispatch_due(self) -> None:
+        now: float = self.clock()
+        with self._lock:
+            due: list[ScheduledPublisher] = self.wheel.advance(now)
+            for scheduled in due:
+                if scheduled.cancelled.is_set():
+                    continue
+                self._dispatch(scheduled, now)
+
+    def _dispatch(self, scheduled: ScheduledPublisher, now: float) -> None:
+        scheduled_time: float = scheduled.deadline
+        if scheduled.running:
+            self.statistics.deadline_misses += 1
+        else:
+            scheduled.running = True
+            self._executor.submit(self._publish, scheduled, scheduled_time)
+
+        # The next deadline follows from the previous one rather than from the time
+        # the payload was built. Periods that have already passed are skipped
+        interval: float = scheduled.publisher.interval
+        scheduled.deadline += interval
+        if scheduled.deadline <= now:
+            skipped: int = math.floor((now - scheduled.deadline) / interval) + 1
+            scheduled.deadline += skipped * interval
+            self.statistics.deadline_misses += skipped
+        self.wheel.add(scheduled, scheduled.deadline)
+
+    def _publish(self, scheduled: ScheduledPublisher, scheduled_time: float) -> None:
+        lateness: float = max(self.clock() - scheduled_time, 0.0)
+        try:
+            scheduled.publish()
+        except Exception:
+            # A failing publisher must not take down the workers shared by all
+            # robots, the publisher is tried again at its next deadline
+            logger.exception(f"Failed to publish {scheduled.publisher.topic}")
+        finally:
+            scheduled.running = False
+        with self._lock:
+            self.statistics.publishes += 1
+            self.statistics.total_lateness += lateness
+            self.statistics.max_lateness = max(self.statistics.max_lateness, lateness)
+
+    def _run(self) -> None:
+        while True:
+            # Sleep until the absolute time of the next tick
+            next_tick_time: float = self.wheel.tick_time(self.wheel.current_tick + 1)
+            if self._signal_stop.wait(max(next_tick_time - self.clock(), 0.0)):
+                return
+            try:
+                self.dispatch_due()
+            except Exception:
+                # Keep the scheduler running, as it publishes for every robot
+                logger.exception("Failed to dispatch telemetry publishers")
+
+
+@cache
+def get_telemetry_scheduler() -> TelemetryScheduler:
+    scheduler: TelemetryScheduler = TelemetryScheduler(
+        tick=settings.TELEMETRY_SCHEDULER_TICK,
+        n_slots=settings.TELEMETRY_SCHEDULER_SLOTS,
+        max_workers=settings.TELEMETRY_SCHEDULER_MAX_WORKERS,
+    )
+    scheduler.start()
+    return scheduler
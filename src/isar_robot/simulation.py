@@ -1,7 +1,9 @@
 import logging
 import random
 import time
-from threading import Event, Thread
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from threading import Event
 
 from robot_interface.models.exceptions.robot_exceptions import (
     RobotMissionStatusException,
@@ -10,56 +12,76 @@ from robot_interface.models.exceptions.robot_exceptions import (
 )
 from robot_interface.models.mission.mission import Mission
 from robot_interface.models.mission.status import MissionStatus, TaskStatus
-from robot_interface.models.mission.task import ReturnToHome
+from robot_interface.models.mission.task import TASKS, InspectionTask, ReturnToHome
 
 from isar_robot.config.settings import settings
+from isar_robot.mission_state import TaskStatusStore
+from isar_robot.recording import TelemetryRecorder
 
 logger = logging.getLogger(__name__)
 
 
-class MissionSimulation(Thread):
+def create_simulation_executor(max_workers: int = 1) -> ThreadPoolExecutor:
+    # Worker threads are created on demand and reused for every mission submitted
+    # to the executor, so starting a new mission does not spawn a new thread
+    return ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="Mission simulation thread"
+    )
+
+
+class MissionSimulation:
     def __init__(
         self,
         mission: Mission,
+        recorder: TelemetryRecorder | None = None,
     ):
         time.sleep(settings.MISSION_SIMULATION_TIME_TO_START)
-        self.mission: Mission = mission
+        self.mission_id: str = mission.id
+        self.recorder: TelemetryRecorder | None = recorder
         self.task_index: int = 0
         self.n_tasks: int = len(mission.tasks)
         self.robot_is_home: bool = False
-        self.task_statuses: list[TaskStatus] = [
-            TaskStatus.NotStarted for _ in self.mission.tasks
-        ]
-        self.task_id_mapping = {}
-        for i, task in enumerate(self.mission.tasks):
-            self.task_id_mapping[task.id] = i
-
-        self.is_return_home: bool = len(self.mission.tasks) == 1 and isinstance(
-            self.mission.tasks[0], ReturnToHome
-        )
-        self.task_failure_probability: float = (
-            settings.MISSION_SIMULATION_TASK_FAILURE_PROBABILITY
+        self.task_statuses: TaskStatusStore = TaskStatusStore(
+            [task.id for task in mission.tasks]
         )
-        self.return_home_task_failure_probability: float = (
-            settings.MISSION_SIMULATION_RETURN_HOME_TASK_FAILURE_PROBABILITY
-        )
-        self.api_delay_modifier: float = settings.MISSION_SIMULATION_API_DELAY_MODIFIER
+        # The mission itself is not kept. Task models are released when the task
+        # is finished, or for inspection tasks when the inspection has been
+        # produced, so that long missions do not hold on to every task
+        self.tasks: list[TASKS | None] = list(mission.tasks)
+        # Wall clock time at which each inspection task finished, by task index, so
+        # that its inspection is stamped with the capture time rather than the time
+        # it was retrieved at
+        self.inspection_times: dict[int, datetime] = {}
 
+        self.is_return_home: bool = len(mission.tasks) == 1 and isinstance(
+            mission.tasks[0], ReturnToHome
+        )
         self.mission_done: bool = False
         self.all_tasks_done: bool = False
         self.mission_started: bool = False
+        self.mission_paused: bool = False
 
         self.signal_resume_mission: Event = Event()
         self.signal_resume_mission.set()
         self.signal_stop_mission: Event = Event()
-        Thread.__init__(self, name="Mission simulation thread")
+        self.future: Future | None = None
+
+    def start(self, executor: ThreadPoolExecutor) -> None:
+        self.future = executor.submit(self.run)
+
+    def is_alive(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def join(self) -> None:
+        # Failures of the job are handled in run, so joining only waits for it. A
+        # cancelled job is not waited for, as wait only counts it as done once a
+        # worker has taken it off the queue
+        if self.future is not None and not self.future.cancelled():
+            wait([self.future])
 
     def stop(self) -> None:
         return
 
-    def _simulate_api_call_delay(self):
-        time.sleep(random.random() * self.api_delay_modifier)
-
     def pause_mission(self):
         if self.mission_done:
             raise RobotNoMissionRunningException(
@@ -88,53 +110,109 @@ class MissionSimulation(Thread):
         time.sleep(settings.MISSION_SIMULATION_TIME_TO_STOP)
         self.signal_stop_mission.set()
         self.signal_resume_mission.set()
+        if self.future is not None and self.future.cancel():
+            # The job was still queued behind the missions of other robots on a
+            # shared executor, and will never run
+            self.mission_done = True
         self.join()
 
     def task_status(self, task_id: str):
-        task_index = self.task_id_mapping[task_id]
-        if task_index < 0 or task_index > self.n_tasks - 1:
+        task_index: int | None = self.task_statuses.index(task_id)
+        if task_index is None:
             raise RobotTaskStatusException(
                 error_description="Task ID did not match any ongoing tasks"
             )
-        return self.task_statuses[task_index]
+        return self.task_statuses.get(task_index)
 
     def current_task(self):
         if self.task_index < self.n_tasks:
-            return self.mission.tasks[self.task_index]
+            return self.tasks[self.task_index]
         return None
 
+    def release_task(self, task_id: str) -> None:
+        # Called when the inspection of the task has been produced
+        task_index: int | None = self.task_statuses.index(task_id)
+        if task_index is not None and task_index < self.task_index:
+            self.tasks[task_index] = None
+            self.inspection_times.pop(task_index, None)
+
+    def inspection_time(self, task_id: str) -> datetime | None:
+        task_index: int | None = self.task_statuses.index(task_id)
+        if task_index is None:
+            return None
+        return self.inspection_times.get(task_index)
+
     def mission_status(self):
         if self.mission_paused:
             return MissionStatus.Paused
-        if all(status == TaskStatus.NotStarted for status in self.task_statuses):
+        if self.task_statuses.all(TaskStatus.NotStarted):
             return MissionStatus.NotStarted
         if not self.mission_done:
             return MissionStatus.InProgress
-        if all(status == TaskStatus.Successful for status in self.task_statuses):
+        if self.task_statuses.all(TaskStatus.Successful):
             return MissionStatus.Successful
-        if any(
-            status in [TaskStatus.InProgress, TaskStatus.NotStarted]
-            for status in self.task_statuses
-        ):
+        if self.task_statuses.any(TaskStatus.InProgress, TaskStatus.NotStarted):
             return MissionStatus.InProgress
-        if all(status == TaskStatus.Failed for status in self.task_statuses):
+        if self.task_statuses.all(TaskStatus.Failed):
             return MissionStatus.Failed
-        if any(status == TaskStatus.Cancelled for status in self.task_statuses):
+        if self.task_statuses.any(TaskStatus.Cancelled):
             return MissionStatus.Cancelled
-        if any(status == TaskStatus.Failed for status in self.task_statuses):
+        if self.task_statuses.any(TaskStatus.Failed):
             return MissionStatus.PartiallySuccessful
         raise RobotMissionStatusException("Unhandled mission status detected")
 
+    def _set_task_status(self, task_index: int, task_status: TaskStatus) -> None:
+        self.task_statuses.set(task_index, task_status)
+        if self.recorder:
+            self.recorder.record_task_status(self.mission_id, task_index, task_status)
+
+    def _record_mission_status(self) -> None:
+        if self.recorder:
+            self.recorder.record_mission_status(self.mission_id, self.mission_status())
+
     def _complete_task(self, task_status: TaskStatus):
         if self.task_index < self.n_tasks:
-            self.task_statuses[self.task_index] = task_status
+            # Only successful inspection tasks produce an inspection. The capture
+            # time is stored before the status is set, as the inspection may be
+            # retrieved as soon as the task is reported successful
+            task: TASKS | None = self.tasks[self.task_index]
+            if task_status != TaskStatus.Successful or not isinstance(
+                task, InspectionTask
+            ):
+                self.tasks[self.task_index] = None
+            else:
+                self.inspection_times[self.task_index] = datetime.now(UTC)
+            self._set_task_status(self.task_index, task_status)
             self.task_index = self.task_index + 1
         if self.task_index >= self.n_tasks:
             self.all_tasks_done = True
         else:
-            self.task_statuses[self.task_index] = TaskStatus.InProgress
+            self._set_task_status(self.task_index, TaskStatus.InProgress)
 
-    def run(self):
+    def _fail_unfinished_tasks(self) -> None:
+        for task_index in range(self.n_tasks):
+            if self.task_statuses.get(task_index) in [
+                TaskStatus.NotStarted,
+                TaskStatus.InProgress,
+            ]:
+                self._set_task_status(task_index, TaskStatus.Failed)
+
+    def run(self) -> None:
+        try:
+            self._simulate()
+        except Exception:
+            # The mission is failed rather than left in progress, as the robot does
+            # not start new missions while one is in progress
+            logger.exception(f"Mission simulation of {self.mission_id} failed")
+            self._fail_unfinished_tasks()
+            self.mission_paused = False
+            self.mission_done = True
+            self._record_mission_status()
+        finally:
+            self.mission_paused = False
+            self.mission_done = True
+
+    def _simulate(self) -> None:
         self.mission_started = True
         self.mission_paused = False
 
@@ -142,28 +220,37 @@ class MissionSimulation(Thread):
             self.mission_done = True
             return
 
-        thread_check_interval = settings.MISSION_SIMULATION_TASK_DURATION
-        self.task_statuses[0] = TaskStatus.InProgress
-        while not self.signal_stop_mission.wait(thread_check_interval):
+        # Settings are read on every step so that they can be reloaded while the
+        # mission is running
+        self._set_task_status(0, TaskStatus.InProgress)
+        self._record_mission_status()
+        while not self.signal_stop_mission.wait(
+            settings.MISSION_SIMULATION_TASK_DURATION
+        ):
             if self.all_tasks_done:
                 break
 
             if not self.signal_resume_mission.is_set():
                 self.mission_paused = True
+                self._record_mission_status()
                 self.signal_resume_mission.wait()
                 self.mission_paused = False
+                self._record_mission_status()
 
             if self.signal_stop_mission.is_set():
                 break
 
             if self.is_return_home:
                 # evaluate is return home failure probability
-                if random.random() < self.return_home_task_failure_probability:
+                if (
+                    random.random()
+                    < settings.MISSION_SIMULATION_RETURN_HOME_TASK_FAILURE_PROBABILITY
+                ):
                     self._complete_task(TaskStatus.Failed)
                     continue
 
             # evaluate task failure probability
-            elif random.random() < self.task_failure_probability:
+            elif random.random() < settings.MISSION_SIMULATION_TASK_FAILURE_PROBABILITY:
                 self._complete_task(TaskStatus.Failed)
                 continue
 
@@ -171,4 +258,5 @@ class MissionSimulation(Thread):
 
         time.sleep(settings.MISSION_SIMULATION_MISSION_COMPLETION_DELAY)
         self.mission_done = True
-        logger.info("Exiting mission simulation thread")
+        self._record_mission_status()
+        logger.info("Exiting mission simulation")
@@ -1,7 +1,9 @@
 import random
+import time
 from datetime import UTC, datetime
 
-from alitra import Frame, Orientation, Pose, Position
+from alitra import Pose, Position
+from robot_interface.models.mission.task import TASKS
 from robot_interface.models.robots.battery_state import BatteryState
 from robot_interface.telemetry.payloads import (
     TelemetryBatteryPayload,
@@ -11,6 +13,10 @@ from robot_interface.telemetry.payloads import (
 )
 
 from isar_robot.config.settings import settings
+from isar_robot.energy import BatteryModel, get_sensor_discharge_rate
+from isar_robot.history import TelemetryHistory
+from isar_robot.pose import PoseSample
+from isar_robot.recording import TelemetryRecorder
 
 
 def _get_pressure_level() -> float:
@@ -26,59 +32,89 @@ def _get_obstacle_status() -> bool:
 
 
 class Telemetry:
-    def __init__(self) -> None:
-        self.current_battery_level: float = 75.0
-        self.min_battery_level: int = 0
-        self.max_battery_level: int = 100
-        self.charging_rate: float = 2.0
-        self.discharging_rate: float = 0.4
-
-        self.current_pose = Pose(
-            Position(
-                x=1,
-                y=1,
-                z=1,
-                frame=Frame("asset"),
-            ),
-            Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
-            frame=Frame("asset"),
+    def __init__(self, recorder: TelemetryRecorder | None = None) -> None:
+        self.battery_model: BatteryModel = BatteryModel(
+            battery_level=settings.BATTERY_INITIAL_LEVEL
         )
+        self.current_battery_level: float = self.battery_model.battery_level
+        # Total distance moved, only added to by the pose publisher. The battery
+        # publisher takes the distance moved since its previous update as the
+        # difference, so that neither thread resets a value the other one writes
+        self.distance_moved: float = 0.0
+        self.distance_moved_at_battery_update: float = 0.0
+
+        self.current_pose_sample: PoseSample = PoseSample(x=1, y=1, z=1)
+        # The alitra Pose of the current sample is built on demand and shared by
+        # every caller until the robot moves. It is never mutated, as each movement
+        # replaces the sample instead, so inspections keep the pose they captured.
+        # The pose is cached together with the sample it was built from, so that a
+        # pose built from a sample that has since been replaced is never served
+        self._current_pose: tuple[PoseSample, Pose] | None = None
         self.movement_percentage: float = 0.9
+        self.history: TelemetryHistory = TelemetryHistory(
+            size=settings.TELEMETRY_HISTORY_SIZE
+        )
+        self.recorder: TelemetryRecorder | None = recorder
 
-    def get_pose(self) -> Pose:
-        return self.current_pose
-
-    def _get_pose(self, current_target: Position | None) -> Pose:
-        if not current_target:
-            return self.current_pose
+    @property
+    def current_pose(self) -> Pose:
+        return self.get_pose()
 
-        self.current_pose.position.x += self.movement_percentage * (
-            current_target.x - self.current_pose.position.x
-        )
-        self.current_pose.position.y += self.movement_percentage * (
-            current_target.y - self.current_pose.position.y
-        )
-        self.current_pose.position.z += self.movement_percentage * (
-            current_target.z - self.current_pose.position.z
+    def get_pose(self) -> Pose:
+        pose_sample: PoseSample = self.current_pose_sample
+        cached_pose: tuple[PoseSample, Pose] | None = self._current_pose
+        if cached_pose is None or cached_pose[0] is not pose_sample:
+            cached_pose = (pose_sample, pose_sample.to_pose())
+            self._current_pose = cached_pose
+        return cached_pose[1]
+
+    def get_pose_at(self, timestamp: datetime) -> Pose:
+        pose_sample: PoseSample | None = self.history.interpolate_pose(
+            timestamp.timestamp()
         )
-        return self.current_pose
+        if pose_sample is None or pose_sample == self.current_pose_sample:
+            return self.get_pose()
+        return pose_sample.to_pose()
 
-    def _get_battery_level(self, is_home: bool | None = None) -> float:
+    def _get_pose(self, current_target: Position | None) -> Pose:
+        if current_target:
+            pose_sample: PoseSample = self.current_pose_sample.moved_towards(
+                current_target, self.movement_percentage
+            )
+            self.distance_moved += self.current_pose_sample.distance_to(pose_sample)
+            self.current_pose_sample = pose_sample
+
+        timestamp: float = time.time()
+        self.history.append_pose(timestamp, self.current_pose_sample)
+        if self.recorder:
+            self.recorder.record_pose(timestamp, self.current_pose_sample)
+        return self.get_pose()
+
+    def _get_battery_level(
+        self, is_home: bool | None = None, current_task: TASKS | None = None
+    ) -> float:
         if settings.SHOULD_HAVE_RANDOM_BATTERY_LEVEL or is_home is None:
             # Return random float in the range [50, 100]
-            return random.randint(500, 1000) / 10.0
-
-        if is_home:
-            self.current_battery_level = min(
-                self.max_battery_level, self.current_battery_level + self.charging_rate
-            )
-        else:
-            self.current_battery_level = max(
-                self.min_battery_level,
-                self.current_battery_level - self.discharging_rate,
-            )
+            battery_level: float = random.randint(500, 1000) / 10.0
+            self._record_battery_level(battery_level)
+            return battery_level
+
+        distance_moved: float = self.distance_moved
+        self.current_battery_level = self.battery_model.update(
+            distance_moved=distance_moved - self.distance_moved_at_battery_update,
+            sensor_discharge_rate=get_sensor_discharge_rate(current_task),
+            is_charging=is_home,
+        )
+        self.distance_moved_at_battery_update = distance_moved
+        self._record_battery_level(self.current_battery_level)
         return self.current_battery_level
 
+    def _record_battery_level(self, battery_level: float) -> None:
+        timestamp: float = time.time()
+        self.history.append_battery_level(timestamp, battery_level)
+        if self.recorder:
+            self.recorder.record_battery_level(timestamp, battery_level)
+
     def _get_battery_state(self, is_home: bool | None = None) -> BatteryState:
         if settings.SHOULD_HAVE_RANDOM_BATTERY_LEVEL or is_home is None:
             return BatteryState.Normal
@@ -86,10 +122,16 @@ class Telemetry:
         return BatteryState.Charging if is_home else BatteryState.Normal
 
     def get_battery_telemetry(
-        self, isar_id: str, robot_name: str, is_home: bool | None = None
+        self,
+        isar_id: str,
+        robot_name: str,
+        is_home: bool | None = None,
+        current_task: TASKS | None = None,
     ) -> str:
         battery_payload: TelemetryBatteryPayload = TelemetryBatteryPayload(
-            battery_level=self._get_battery_level(is_home=is_home),
+            battery_level=self._get_battery_level(
+                is_home=is_home, current_task=current_task
+            ),
             battery_state=self._get_battery_state(is_home=is_home),
             isar_id=isar_id,
             robot_name=robot_name,
@@ -120,8 +162,13 @@ class Telemetry:
         return obstacle_status_payload.model_dump_json()
 
     def get_pressure_telemetry(self, isar_id: str, robot_name: str) -> str:
+        pressure_level: float = _get_pressure_level()
+        timestamp: float = time.time()
+        self.history.append_pressure_level(timestamp, pressure_level)
+        if self.recorder:
+            self.recorder.record_pressure_level(timestamp, pressure_level)
         pressure_payload: TelemetryPressurePayload = TelemetryPressurePayload(
-            pressure_level=_get_pressure_level(),
+            pressure_level=pressure_level,
             isar_id=isar_id,
             robot_name=robot_name,
             timestamp=datetime.now(UTC),
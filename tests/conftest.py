@@ -0,0 +1,19 @@
+import pytest
+
+from isar_robot.config.settings import settings
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now: float = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fast_simulation(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "MISSION_SIMULATION_TIME_TO_START", 0.0)
+    monkeypatch.setattr(settings, "MISSION_SIMULATION_TIME_TO_STOP", 0.0)
+    monkeypatch.setattr(settings, "MISSION_SIMULATION_TASK_DURATION", 0.01)
+    monkeypatch.setattr(settings, "MISSION_SIMULATION_MISSION_COMPLETION_DELAY", 0.0)
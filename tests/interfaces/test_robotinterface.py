@@ -1,7 +1,14 @@
+import time
+
+import pytest
+from alitra import Frame, Orientation, Pose, Position
+from robot_interface.models.mission.mission import Mission
 from robot_interface.models.mission.status import RobotStatus
+from robot_interface.models.mission.task import TakeImage
 from robot_interface.test_robot_interface import interface_test
 
 from isar_robot.config.settings import settings
+from isar_robot.faults import Fault, FaultType
 from isar_robot.robotinterface import Robot
 
 
@@ -60,3 +67,73 @@ def test_initial_robot_status_is_home_when_should_start_at_home(mocker):
     mocker.patch.object(settings, "SHOULD_START_AT_HOME", True)
     robot = Robot(robot_name="Robot", isar_id="00000000-0000-0000-0000-000000000000")
     assert robot.robot_status() == RobotStatus.Home
+
+
+def test_retried_get_inspection_returns_same_inspection():
+    robot = Robot(robot_name="Robot", isar_id="00000000-0000-0000-0000-000000000000")
+    task = TakeImage(
+        target=Position(x=0, y=0, z=0, frame=Frame("robot")),
+        robot_pose=Pose(
+            Position(0, 0, 0, Frame("asset")),
+            Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+            Frame("asset"),
+        ),
+    )
+
+    inspection = robot.get_inspection(task)
+    retried_inspection = robot.get_inspection(task)
+
+    assert retried_inspection is inspection
+    assert robot.inspection_cache.statistics.hits == 1
+
+
+def test_inspection_is_stamped_with_the_pose_at_capture_time(fast_simulation):
+    robot = Robot(robot_name="Robot", isar_id="00000000-0000-0000-0000-000000000000")
+    task = TakeImage(
+        target=Position(x=0, y=0, z=0, frame=Frame("robot")),
+        robot_pose=Pose(
+            Position(0, 0, 0, Frame("asset")),
+            Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+            Frame("asset"),
+        ),
+    )
+    robot.telemetry._get_pose(current_target=None)
+    robot.initiate_mission(Mission(name="Mission", tasks=[task]))
+    robot.mission_simulation.join()
+    capture_time = robot.mission_simulation.inspection_time(task.id)
+    robot.telemetry._get_pose(current_target=None)
+    # The robot moves on before the inspection is retrieved
+    time.sleep(0.01)
+    robot.telemetry._get_pose(
+        current_target=Position(x=11, y=1, z=1, frame=Frame("asset"))
+    )
+
+    inspection = robot.get_inspection(task)
+
+    assert capture_time is not None
+    assert inspection.metadata.start_time == capture_time
+    assert inspection.metadata.robot_pose.position.x == 1
+    assert robot.telemetry.get_pose().position.x == 10
+
+
+def test_robot_api_latency_is_tracked():
+    robot = Robot(robot_name="Robot", isar_id="00000000-0000-0000-0000-000000000000")
+    for _ in range(3):
+        robot.robot_status()
+
+    [latency] = robot.latency_tracker.report()
+    assert latency.method == "robot_status"
+    assert latency.calls == 3
+
+
+def test_fault_script_that_fails_to_load_keeps_active_faults(tmp_path):
+    robot = Robot(robot_name="Robot", isar_id="00000000-0000-0000-0000-000000000000")
+    fault = Fault(target="robot_status", type=FaultType.Latency)
+    robot.fault_injector.add_fault(fault)
+
+    with pytest.raises(FileNotFoundError):
+        robot._on_settings_reloaded(
+            {"FAULT_INJECTION_SCRIPT": str(tmp_path / "missing.json")}
+        )
+
+    assert robot.fault_injector.faults == [fault]
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from isar_robot.config.settings import settings
+from isar_robot.energy import (
+    BatteryModel,
+    compute_battery_levels,
+    simulate_discharge,
+    time_until_battery_level,
+)
+from tests.conftest import FakeClock
+
+
+def test_compute_battery_levels_for_fleet() -> None:
+    battery_levels = compute_battery_levels(
+        battery_levels=[50.0, 50.0, 50.0, 99.9],
+        elapsed_time=10.0,
+        distance_moved=[0.0, 100.0, 0.0, 0.0],
+        sensor_discharge_rate=0.0,
+        is_charging=[False, False, True, True],
+    )
+
+    idle_discharge = 10.0 * settings.BATTERY_IDLE_DISCHARGE_RATE
+    motion_discharge = 100.0 * settings.BATTERY_MOTION_DISCHARGE_PER_METER
+    assert battery_levels[0] == 50.0 - idle_discharge
+    assert battery_levels[1] == 50.0 - idle_discharge - motion_discharge
+    assert battery_levels[2] == 50.0 + 10.0 * settings.BATTERY_CHARGING_RATE
+    assert battery_levels[3] == 100.0
+
+
+def test_simulate_discharge_is_monotonic_and_bounded() -> None:
+    battery_levels = simulate_discharge(
+        battery_levels=[100.0, 10.0],
+        speed=[0.0, 1.0],
+        sensor_discharge_rate=[0.0, 0.01],
+        duration=3600.0,
+        time_step=1.0,
+    )
+
+    assert battery_levels.shape == (3601, 2)
+    assert np.all(np.diff(battery_levels, axis=0) <= 0)
+    assert np.all(battery_levels >= 0.0)
+    assert battery_levels[-1, 1] == 0.0
+
+
+def test_time_until_battery_level_matches_simulation() -> None:
+    time_until_empty = time_until_battery_level(
+        battery_levels=[20.0],
+        target_battery_level=0.0,
+        speed=0.5,
+        sensor_discharge_rate=0.0,
+    )
+    battery_levels = simulate_discharge(
+        battery_levels=[20.0],
+        speed=0.5,
+        sensor_discharge_rate=0.0,
+        duration=float(time_until_empty[0]) + 1.0,
+        time_step=1.0,
+    )
+
+    assert battery_levels[-1, 0] == 0.0
+    assert battery_levels[-3, 0] > 0.0
+
+
+def test_battery_model_does_not_depend_on_update_frequency() -> None:
+    clock = FakeClock()
+    frequent_model = BatteryModel(battery_level=50.0, clock=clock)
+    single_update_model = BatteryModel(battery_level=50.0, clock=clock)
+
+    for _ in range(100):
+        clock.now += 0.1
+        frequent_model.update(
+            distance_moved=0.1, sensor_discharge_rate=0.002, is_charging=False
+        )
+    single_update_model.update(
+        distance_moved=10.0, sensor_discharge_rate=0.002, is_charging=False
+    )
+
+    expected_level: float = (
+        50.0
+        - 10.0 * (settings.BATTERY_IDLE_DISCHARGE_RATE + 0.002)
+        - 10.0 * settings.BATTERY_MOTION_DISCHARGE_PER_METER
+    )
+    assert frequent_model.battery_level == pytest.approx(expected_level)
+    assert single_update_model.battery_level == pytest.approx(expected_level)
+
+
+def test_discharge_rate_matches_battery_model() -> None:
+    time_until_empty = time_until_battery_level(
+        battery_levels=[10.0],
+        target_battery_level=0.0,
+        speed=1.0,
+        sensor_discharge_rate=0.004,
+    )
+
+    discharge_rate: float = (
+        settings.BATTERY_IDLE_DISCHARGE_RATE
+        + 0.004
+        + settings.BATTERY_MOTION_DISCHARGE_PER_METER
+    )
+    assert time_until_empty[0] == pytest.approx(10.0 / discharge_rate)
+
+
+def test_battery_model_matches_fleet_computation() -> None:
+    clock = FakeClock()
+    discharging_model = BatteryModel(battery_level=50.0, clock=clock)
+    charging_model = BatteryModel(battery_level=99.9, clock=clock)
+    clock.now = 10.0
+
+    discharging_model.update(
+        distance_moved=100.0, sensor_discharge_rate=0.002, is_charging=False
+    )
+    charging_model.update(
+        distance_moved=0.0, sensor_discharge_rate=0.0, is_charging=True
+    )
+
+    battery_levels = compute_battery_levels(
+        battery_levels=[50.0, 99.9],
+        elapsed_time=10.0,
+        distance_moved=[100.0, 0.0],
+        sensor_discharge_rate=[0.002, 0.0],
+        is_charging=[False, True],
+    )
+    assert discharging_model.battery_level == battery_levels[0]
+    assert charging_model.battery_level == battery_levels[1] == 100.0
@@ -0,0 +1,84 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+from robot_interface.models.exceptions.robot_exceptions import (
+    RobotCommunicationException,
+    RobotTelemetryNoUpdateException,
+)
+
+from isar_robot.faults import Fault, FaultInjector, FaultType, load_fault_script
+
+
+def test_exception_fault_scheduled_by_call_count() -> None:
+    fault_injector = FaultInjector(
+        [
+            Fault(
+                target="initiate_mission",
+                type=FaultType.Exception,
+                start_call=2,
+                end_call=4,
+            )
+        ]
+    )
+
+    fault_injector.apply("initiate_mission")
+    for _ in range(2):
+        with pytest.raises(RobotCommunicationException):
+            fault_injector.apply("initiate_mission")
+    fault_injector.apply("initiate_mission")
+    fault_injector.apply("task_status")
+
+
+def test_latency_fault_scheduled_by_time() -> None:
+    fault_injector = FaultInjector(
+        [Fault(target="task_status", type=FaultType.Latency, delay=0.1, end_time=60)]
+    )
+
+    start = time.perf_counter()
+    fault_injector.apply("task_status")
+
+    assert time.perf_counter() - start >= 0.1
+
+    fault_injector.start_time -= 60
+    start = time.perf_counter()
+    fault_injector.apply("task_status")
+
+    assert time.perf_counter() - start < 0.1
+
+
+def test_telemetry_faults() -> None:
+    fault_injector = FaultInjector()
+
+    assert fault_injector.apply_to_telemetry("pose") == 1
+
+    fault_injector.add_fault(
+        Fault(target="telemetry/pose", type=FaultType.Burst, burst_size=5)
+    )
+    fault_injector.add_fault(Fault(target="telemetry/battery", type=FaultType.Drop))
+
+    assert fault_injector.apply_to_telemetry("pose") == 5
+    with pytest.raises(RobotTelemetryNoUpdateException):
+        fault_injector.apply_to_telemetry("battery")
+
+    fault_injector.clear()
+
+    assert fault_injector.apply_to_telemetry("pose") == 1
+
+
+def test_load_fault_script(tmp_path: Path) -> None:
+    script = tmp_path / "faults.json"
+    script.write_text(
+        json.dumps(
+            [
+                {"target": "task_status", "type": "timeout", "delay": 1.0},
+                {"target": "telemetry/pressure", "type": "stall", "start_time": 10},
+            ]
+        )
+    )
+
+    faults = load_fault_script(script)
+
+    assert [fault.type for fault in faults] == [FaultType.Timeout, FaultType.Stall]
+    assert faults[1].start_time == 10
@@ -0,0 +1,79 @@
+import time
+from queue import Queue
+
+from robot_interface.telemetry.mqtt_client import props_expiry
+
+from isar_robot.config.settings import settings
+from isar_robot.fleet import (
+    FleetReport,
+    MissionStatistics,
+    RobotFleet,
+    ShardedFleet,
+    _drain_queue,
+    create_robot_identities,
+)
+
+
+def test_fleet_reports_merge() -> None:
+    report = FleetReport(
+        mission_statistics=MissionStatistics(missions_completed=1),
+        memory_kib=100,
+        api_call_durations={"task_status": [0.1]},
+    )
+    report.merge(
+        FleetReport(
+            mission_statistics=MissionStatistics(missions_completed=2),
+            memory_kib=50,
+            api_call_durations={"task_status": [0.2]},
+        )
+    )
+
+    assert report.mission_statistics.missions_completed == 3
+    assert report.api_call_durations["task_status"] == [0.1, 0.2]
+    assert report.memory_kib == 150
+
+
+def test_drained_telemetry_keeps_message_expiry() -> None:
+    queue: Queue = Queue()
+    queue.put(("isar/isar_id/pose", "{}", 0, False, props_expiry(10)))
+    queue.put(("isar/isar_id/obstacle_status", "{}", 0, False, None))
+
+    assert _drain_queue(queue, max_batch_size=10) == [
+        ("isar/isar_id/pose", "{}", 0, False, 10),
+        ("isar/isar_id/obstacle_status", "{}", 0, False, None),
+    ]
+
+
+def test_sharded_fleet_forwards_telemetry_from_all_robots(monkeypatch) -> None:
+    # Shards run in spawned processes, so settings are passed through the environment
+    monkeypatch.setenv("ROBOT_ROBOT_POSE_PUBLISH_INTERVAL", "0.1")
+    robot_identities = create_robot_identities(n_robots=4)
+    queue: Queue = Queue()
+
+    fleet = ShardedFleet(robot_identities=robot_identities, queue=queue, n_shards=2)
+    fleet.start()
+    time.sleep(3.0)
+    fleet.stop()
+
+    topics: set[str] = set()
+    while not queue.empty():
+        topic, _, _, _, properties = queue.get()
+        topics.add(topic)
+        if topic.endswith("/pose"):
+            assert properties.MessageExpiryInterval > 0
+
+    assert fleet.n_shards == 2
+    for _, isar_id in robot_identities:
+        assert f"isar/{isar_id}/pose" in topics
+
+
+def test_robot_fleet_stops_telemetry_publishers(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ROBOT_POSE_PUBLISH_INTERVAL", 0.05)
+    fleet = RobotFleet(robot_identities=create_robot_identities(2), queue=Queue())
+
+    fleet.start()
+    time.sleep(0.2)
+    fleet.stop()
+
+    assert len(fleet.publisher_threads) == 8
+    assert not any(thread.is_alive() for thread in fleet.publisher_threads)
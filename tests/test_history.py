@@ -0,0 +1,84 @@
+import numpy as np
+
+from isar_robot.history import RingBuffer, TelemetryHistory
+from isar_robot.pose import PoseSample
+from tests.conftest import FakeClock
+
+
+def test_ring_buffer_overwrites_oldest_samples() -> None:
+    ring_buffer = RingBuffer(size=4, n_columns=1)
+    for timestamp in range(10):
+        ring_buffer.append(float(timestamp), float(timestamp) * 10)
+
+    segments = ring_buffer.segments()
+    timestamps = np.concatenate([timestamps for timestamps, _ in segments])
+
+    assert len(ring_buffer) == 4
+    assert list(timestamps) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_ring_buffer_window() -> None:
+    ring_buffer = RingBuffer(size=5, n_columns=1)
+    for timestamp in range(8):
+        ring_buffer.append(float(timestamp), float(timestamp) * 10)
+
+    timestamps, values = ring_buffer.window(start_time=4.0, end_time=6.5)
+
+    assert list(timestamps) == [4.0, 5.0, 6.0]
+    assert list(values[:, 0]) == [40.0, 50.0, 60.0]
+
+
+def test_ring_buffer_interpolate() -> None:
+    ring_buffer = RingBuffer(size=3, n_columns=2)
+    for timestamp in range(5):
+        ring_buffer.append(float(timestamp), float(timestamp), -float(timestamp))
+
+    assert ring_buffer.interpolate(3.25) is not None
+    assert list(ring_buffer.interpolate(3.25)) == [3.25, -3.25]
+    assert list(ring_buffer.interpolate(0.0)) == [2.0, -2.0]
+    assert list(ring_buffer.interpolate(10.0)) == [4.0, -4.0]
+    assert RingBuffer(size=3, n_columns=2).interpolate(1.0) is None
+
+
+def test_interpolated_pose_has_normalized_orientation() -> None:
+    clock, wall_clock = FakeClock(100.0), FakeClock(1000.0)
+    history = TelemetryHistory(size=10, clock=clock, wall_clock=wall_clock)
+    history.append_pose(wall_clock.now, PoseSample(0, 0, 0, 0, 0, 0, 1))
+    clock.now, wall_clock.now = 101.0, 1001.0
+    history.append_pose(wall_clock.now, PoseSample(2, 0, 0, 0, 0, 1, 0))
+
+    pose = history.interpolate_pose(1000.5)
+
+    assert pose is not None
+    assert pose.x == 1.0
+    assert np.isclose(np.linalg.norm([pose.qx, pose.qy, pose.qz, pose.qw]), 1.0)
+
+
+def test_history_is_ordered_when_the_wall_clock_jumps_back() -> None:
+    clock, wall_clock = FakeClock(100.0), FakeClock(1000.0)
+    history = TelemetryHistory(size=10, clock=clock, wall_clock=wall_clock)
+    history.append_pose(wall_clock.now, PoseSample(x=0, y=0, z=0))
+    # The wall clock is set back an hour between the samples
+    clock.now, wall_clock.now = 101.0, 1001.0 - 3600
+    history.append_pose(wall_clock.now, PoseSample(x=2, y=0, z=0))
+
+    pose = history.interpolate_pose(wall_clock.now - 0.5)
+
+    assert pose is not None
+    assert pose.x == 1.0
+    timestamps, values = history.pose.window(start_time=0.0, end_time=200.0)
+    assert list(timestamps) == [100.0, 101.0]
+    assert list(values[:, 0]) == [1000.0, 1001.0 - 3600]
+
+
+def test_history_window_by_wall_clock_time() -> None:
+    clock, wall_clock = FakeClock(100.0), FakeClock(1000.0)
+    history = TelemetryHistory(size=10, clock=clock, wall_clock=wall_clock)
+    for battery_level in [90.0, 80.0, 70.0]:
+        history.append_battery_level(wall_clock.now, battery_level)
+        clock.now, wall_clock.now = clock.now + 1, wall_clock.now + 1
+
+    wall_times, values = history.window(history.battery, 1000.5, 1002.0)
+
+    assert list(wall_times) == [1001.0, 1002.0]
+    assert list(values[:, 0]) == [80.0, 70.0]
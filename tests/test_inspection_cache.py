@@ -0,0 +1,105 @@
+from datetime import UTC, datetime
+
+from alitra import Frame, Orientation, Pose, Position
+from robot_interface.models.inspection.inspection import Image, ImageMetadata
+
+from isar_robot.inspection_cache import InspectionCache, inspection_metadata_size
+from tests.conftest import FakeClock
+
+robot_pose = Pose(
+    Position(0, 0, 0, Frame("asset")),
+    Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+    Frame("asset"),
+)
+target = Position(x=0, y=0, z=0, frame=Frame("robot"))
+
+
+def _create_image(task_id: str, size: int) -> Image:
+    metadata = ImageMetadata(
+        start_time=datetime.now(UTC),
+        robot_pose=robot_pose,
+        target_position=target,
+        file_type="jpg",
+    )
+    return Image(metadata=metadata, id=task_id, data=bytes(size))
+
+
+def test_cached_inspection_is_returned() -> None:
+    cache = InspectionCache(max_entries=2, max_bytes=1_000_000, time_to_live=60)
+    image = _create_image("a", 100)
+
+    assert cache.get("a") is None
+    cache.put("a", image)
+
+    assert cache.get("a") is image
+    assert cache.statistics.hits == 1
+    assert cache.statistics.misses == 1
+
+
+def test_least_recently_used_inspection_is_evicted() -> None:
+    cache = InspectionCache(max_entries=2, max_bytes=1_000_000, time_to_live=60)
+    cache.put("a", _create_image("a", 100))
+    cache.put("b", _create_image("b", 100))
+    cache.get("a")
+    cache.put("c", _create_image("c", 100))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.statistics.evictions == 1
+
+
+def test_inspections_are_evicted_above_size_limit() -> None:
+    max_bytes: int = 2 * (1000 + inspection_metadata_size)
+    cache = InspectionCache(max_entries=10, max_bytes=max_bytes, time_to_live=60)
+    for task_id in ["a", "b", "c"]:
+        cache.put(task_id, _create_image(task_id, 1000))
+
+    assert len(cache) == 2
+    assert cache.size <= max_bytes
+    assert cache.get("a") is None
+
+    # Inspections larger than the whole cache are not cached
+    cache.put("d", _create_image("d", max_bytes))
+    assert cache.get("d") is None
+    assert len(cache) == 2
+
+
+def test_inspections_expire() -> None:
+    clock = FakeClock()
+    cache = InspectionCache(
+        max_entries=10, max_bytes=1_000_000, time_to_live=60, clock=clock
+    )
+    cache.put("a", _create_image("a", 100))
+
+    clock.now = 59
+    assert cache.get("a") is not None
+    clock.now = 61
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_expired_inspections_are_purged_when_adding() -> None:
+    clock = FakeClock()
+    cache = InspectionCache(
+        max_entries=10, max_bytes=1_000_000, time_to_live=60, clock=clock
+    )
+    cache.put("a", _create_image("a", 100))
+    clock.now = 30
+    cache.put("b", _create_image("b", 100))
+
+    clock.now = 61
+    cache.put("c", _create_image("c", 100))
+
+    assert len(cache) == 2
+    assert cache.size == 2 * (100 + inspection_metadata_size)
+    assert cache.statistics.expirations == 1
+    assert cache.get("b") is not None
+
+
+def test_disabled_cache_holds_nothing() -> None:
+    cache = InspectionCache(max_entries=0, max_bytes=1_000_000, time_to_live=60)
+    cache.put("a", _create_image("a", 100))
+
+    assert cache.get("a") is None
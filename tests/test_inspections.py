@@ -1,3 +1,5 @@
+from datetime import UTC, datetime
+
 from alitra import Frame, Orientation, Pose, Position
 from robot_interface.models.mission.task import (
     AcousticDetectionType,
@@ -17,12 +19,15 @@ robot_pose = Pose(
 )
 target = Position(x=0, y=0, z=0, frame=Frame("robot"))
 telemetryModule = telemetry.Telemetry()
+capture_time = datetime.now(UTC)
 
 
 def test_create_image() -> None:
     task_actions = TakeImage(id="id", target=target, robot_pose=robot_pose)
 
-    inspection_image = inspections.create_image(task_actions, telemetryModule)
+    inspection_image = inspections.create_image(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection_image.metadata.file_type == "jpg"
 
@@ -30,7 +35,9 @@ def test_create_image() -> None:
 def test_create_thermal_image() -> None:
     task_actions = TakeThermalImage(id="id", target=target, robot_pose=robot_pose)
 
-    inspection_image = inspections.create_thermal_image(task_actions, telemetryModule)
+    inspection_image = inspections.create_thermal_image(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection_image.metadata.file_type == "fff"
 
@@ -38,7 +45,9 @@ def test_create_thermal_image() -> None:
 def test_create_video() -> None:
     task_actions = TakeImage(id="id", target=target, robot_pose=robot_pose)
 
-    inspection_video = inspections.create_video(task_actions, telemetryModule)
+    inspection_video = inspections.create_video(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection_video.metadata.file_type == "mp4"
 
@@ -48,7 +57,9 @@ def test_create_thermal_video() -> None:
         id="id", target=target, duration=10, robot_pose=robot_pose
     )
 
-    inspection_video = inspections.create_thermal_video(task_actions, telemetryModule)
+    inspection_video = inspections.create_thermal_video(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection_video.metadata.file_type == "mp4"
     assert inspection_video.metadata.duration == 10
@@ -59,7 +70,9 @@ def test_create_audio() -> None:
         id="id", target=target, duration=10, robot_pose=robot_pose
     )
 
-    inspection_recording = inspections.create_audio(task_actions, telemetryModule)
+    inspection_recording = inspections.create_audio(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection_recording.metadata.file_type == "wav"
     assert inspection_recording.metadata.duration == 10
@@ -76,7 +89,9 @@ def test_create_acoustic_measurement() -> None:
         detection_type=AcousticDetectionType.leak,
     )
 
-    inspection = inspections.create_acoustic_measurement(task_actions, telemetryModule)
+    inspection = inspections.create_acoustic_measurement(
+        task_actions, telemetryModule, capture_time
+    )
 
     assert inspection.metadata.file_type == "mp4"
     assert inspection.metadata.frequency_from == 35000
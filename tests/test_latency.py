@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from isar_robot.config.settings import settings
+from isar_robot.latency import (
+    LatencyTracker,
+    get_api_delay,
+    get_percentile,
+    summarize_latency,
+    tracked_api_call,
+)
+
+
+class FakeRobot:
+    def __init__(self) -> None:
+        self.latency_tracker: LatencyTracker = LatencyTracker(window_size=100)
+
+    @tracked_api_call
+    def task_status(self, task_id: str) -> str:
+        if task_id == "missing":
+            raise KeyError(task_id)
+        return "in_progress"
+
+
+def test_percentiles_use_nearest_rank() -> None:
+    durations: list[float] = [float(i) for i in range(1, 101)]
+
+    assert get_percentile(durations, 50) == 50.0
+    assert get_percentile(durations, 99) == 99.0
+    assert get_percentile(durations, 100) == 100.0
+    assert get_percentile([], 50) == 0.0
+
+
+def test_latency_target_is_checked_at_percentile(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "API_LATENCY_SLO_TARGETS", {"task_status": 0.5})
+    monkeypatch.setattr(settings, "API_LATENCY_SLO_PERCENTILE", 90.0)
+    durations: list[float] = [0.1] * 95 + [1.0] * 5
+
+    latency = summarize_latency("task_status", durations)
+
+    assert latency.slo_met
+    assert latency.slo_violations == 5
+    assert latency.percentiles[99.0] == 1.0
+    assert "target p90 500 ms met (5 slow calls)" in latency.summary()
+    assert summarize_latency("task_status", [1.0] * 20).slo_met is False
+
+
+def test_tracker_keeps_a_window_of_durations() -> None:
+    tracker = LatencyTracker(window_size=10)
+    for i in range(25):
+        tracker.record("robot_status", float(i))
+
+    [latency] = tracker.report()
+    assert latency.calls == 10
+    assert latency.percentiles[50.0] == 19.0
+
+
+def test_tracked_calls_are_recorded_including_failures() -> None:
+    robot = FakeRobot()
+
+    assert robot.task_status("task") == "in_progress"
+    with pytest.raises(KeyError):
+        robot.task_status("missing")
+
+    [latency] = robot.latency_tracker.report()
+    assert latency.method == "task_status"
+    assert latency.calls == 2
+
+
+def test_lognormal_delay_is_applied(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "API_DELAY_MODE", "lognormal")
+    monkeypatch.setattr(settings, "API_DELAY_MEDIANS", {"task_status": 0.02})
+    monkeypatch.setattr(settings, "API_DELAY_MAX", 0.05)
+    robot = FakeRobot()
+
+    start = time.perf_counter()
+    for _ in range(10):
+        robot.task_status("task")
+    elapsed = time.perf_counter() - start
+
+    assert 0.05 < elapsed < 1.0
+    delays = [get_api_delay("task_status") for _ in range(1000)]
+    assert max(delays) <= 0.05
+    assert 0.015 < sorted(delays)[500] < 0.025
+    assert get_api_delay("robot_status") == 0.0
+
+
+def test_no_delay_by_default() -> None:
+    assert settings.API_DELAY_MODE == "none"
+    assert get_api_delay("task_status") == 0.0
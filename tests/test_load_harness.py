@@ -0,0 +1,35 @@
+from queue import Queue
+
+import pytest
+
+from isar_robot.config.settings import settings
+from isar_robot.load_harness import CountingSink, run_load_test
+
+
+@pytest.fixture
+def fast_telemetry(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "ROBOT_POSE_PUBLISH_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "ROBOT_BATTERY_PUBLISH_INTERVAL", 0.05)
+
+
+def test_counting_sink_records_publish_intervals() -> None:
+    sink = CountingSink(Queue())
+    sink._record("isar/robot_1/pose", "{}", arrival_time=1.0)
+    sink._record("isar/robot_2/pose", "{}", arrival_time=1.2)
+    sink._record("isar/robot_1/pose", "{}", arrival_time=2.0)
+
+    assert sink.topics["pose"].message_count == 3
+    assert sink.topics["pose"].total_bytes == 6
+    assert sink.topics["pose"].publish_intervals == [1.0]
+
+
+def test_run_load_test(fast_simulation, fast_telemetry) -> None:
+    report = run_load_test(n_robots=2, duration=1.0, n_tasks=2, poll_interval=0.01)
+
+    assert report.messages_per_second > 0
+    assert report.topics["pose"].message_count > 0
+    assert report.missions.missions_completed > 0
+    assert report.missions.inspections_retrieved > 0
+    assert len(report.api_call_durations["task_status"]) > 0
+    assert "initiate_mission" not in report.api_call_durations
+    assert "Telemetry messages/s" in report.summary()
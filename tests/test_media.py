@@ -0,0 +1,149 @@
+import io
+import wave
+from concurrent.futures import wait
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from isar_robot.media import (
+    AudioProcessingConfig,
+    ImageProcessingConfig,
+    MediaProcessor,
+    ProcessedMedia,
+    process_media_file,
+    recompress_image,
+    resample_audio,
+)
+
+no_image_processing = ImageProcessingConfig(quality=0, max_size=0)
+
+
+def _create_wav(sample_rate: int, duration: float, frequency: float = 440) -> bytes:
+    times = np.arange(int(sample_rate * duration)) / sample_rate
+    samples = np.round(np.sin(2 * np.pi * frequency * times) * 10000).astype(np.int16)
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return output.getvalue()
+
+
+def test_audio_is_resampled() -> None:
+    data: bytes = _create_wav(sample_rate=48000, duration=1.0)
+
+    resampled: bytes = resample_audio(
+        data, AudioProcessingConfig(sample_rate=16000, sample_width=1)
+    )
+
+    with wave.open(io.BytesIO(resampled)) as wav:
+        assert wav.getframerate() == 16000
+        assert wav.getsampwidth() == 1
+        assert wav.getnframes() == 16000
+    assert len(resampled) < len(data) / 5
+
+
+def test_audio_is_unchanged_without_configuration() -> None:
+    data: bytes = _create_wav(sample_rate=48000, duration=0.1)
+
+    assert resample_audio(data, AudioProcessingConfig(0, 0)) is data
+
+
+def test_processed_file_is_never_larger(tmp_path: Path) -> None:
+    filepath: Path = tmp_path / "audio.wav"
+    filepath.write_bytes(_create_wav(sample_rate=8000, duration=0.1))
+
+    processed: ProcessedMedia = process_media_file(
+        filepath,
+        "wav",
+        no_image_processing,
+        AudioProcessingConfig(sample_rate=16000, sample_width=4),
+    )
+
+    assert processed.data == filepath.read_bytes()
+    assert processed.original_size == len(processed.data)
+
+
+def test_image_is_recompressed() -> None:
+    pil_image = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    pil_image.new("RGB", (400, 300), color=(120, 80, 40)).save(
+        output, format="JPEG", quality=100
+    )
+
+    recompressed: bytes = recompress_image(
+        output.getvalue(), ImageProcessingConfig(quality=50, max_size=100)
+    )
+
+    with pil_image.open(io.BytesIO(recompressed)) as image:
+        assert max(image.size) == 100
+
+
+def test_audio_is_filtered_before_downsampling() -> None:
+    # A 12 kHz tone is above the Nyquist frequency at 16 kHz, and would alias to
+    # 4 kHz if it was not filtered out
+    data: bytes = _create_wav(sample_rate=48000, duration=1.0, frequency=12000)
+
+    resampled: bytes = resample_audio(
+        data, AudioProcessingConfig(sample_rate=16000, sample_width=0)
+    )
+
+    with wave.open(io.BytesIO(resampled)) as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    # The edges are left out, where the filter only partly covers the samples
+    assert np.abs(samples[100:-100]).max() < 10000 * 0.01
+
+
+def test_media_processor_reports_bytes_saved(tmp_path: Path) -> None:
+    filepath: Path = tmp_path / "audio.wav"
+    data: bytes = _create_wav(sample_rate=48000, duration=1.0)
+    filepath.write_bytes(data)
+    processor = MediaProcessor(
+        max_workers=1,
+        image_config=no_image_processing,
+        audio_config=AudioProcessingConfig(sample_rate=16000, sample_width=0),
+    )
+
+    processor.prefetch(filepath, "wav").result()
+    for _ in range(2):
+        processed: bytes | None = processor.get_processed(filepath, "wav")
+    processor.shutdown()
+
+    assert processed is not None
+    assert processor.statistics.inspections == 2
+    assert processor.statistics.bytes_saved == 2 * (len(data) - len(processed))
+    assert processor.statistics.bytes_saved > len(data)
+
+
+def test_media_processor_does_not_wait_for_processing(tmp_path: Path) -> None:
+    filepath: Path = tmp_path / "audio.wav"
+    filepath.write_bytes(_create_wav(sample_rate=48000, duration=1.0))
+    processor = MediaProcessor(
+        max_workers=1,
+        image_config=no_image_processing,
+        audio_config=AudioProcessingConfig(sample_rate=16000, sample_width=0),
+    )
+
+    # The worker process has not even started yet
+    assert processor.get_processed(filepath, "wav") is None
+    processor.shutdown()
+
+    assert processor.statistics.unprocessed_inspections == 1
+
+
+def test_media_processor_falls_back_to_original_data(tmp_path: Path) -> None:
+    processor = MediaProcessor(
+        max_workers=1,
+        image_config=no_image_processing,
+        audio_config=AudioProcessingConfig(sample_rate=16000, sample_width=0),
+    )
+
+    wait([processor.prefetch(tmp_path / "missing.wav", "wav")])
+    processed: bytes | None = processor.get_processed(tmp_path / "missing.wav", "wav")
+    processor.shutdown()
+
+    assert processed is None
+    assert processor.statistics.unprocessed_inspections == 1
+    assert processor.statistics.bytes_saved == 0
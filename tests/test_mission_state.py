@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+from robot_interface.models.mission.status import TaskStatus
+
+from isar_robot.mission_state import TaskStatusStore
+
+
+def test_index_finds_task_position() -> None:
+    task_ids: list[str] = [str(uuid4()) for _ in range(1000)]
+    store = TaskStatusStore(task_ids)
+
+    for position, task_id in enumerate(task_ids):
+        assert store.index(task_id) == position
+    assert store.index(str(uuid4())) is None
+
+
+def test_index_handles_ids_outside_sorted_range() -> None:
+    store = TaskStatusStore(["b", "c"])
+
+    assert store.index("a") is None
+    assert store.index("d") is None
+
+
+def test_statuses_are_stored_per_task() -> None:
+    store = TaskStatusStore(["a", "b", "c"])
+    assert store.all(TaskStatus.NotStarted)
+
+    store.set(0, TaskStatus.Successful)
+    store.set(1, TaskStatus.Failed)
+
+    assert store.get(0) == TaskStatus.Successful
+    assert store.get(1) == TaskStatus.Failed
+    assert store.get(2) == TaskStatus.NotStarted
+    assert store.count(TaskStatus.Successful, TaskStatus.Failed) == 2
+    assert store.any(TaskStatus.Failed)
+    assert not store.any(TaskStatus.Cancelled)
+    assert not store.all(TaskStatus.Successful)
+
+
+def test_store_uses_one_byte_per_task_status() -> None:
+    store = TaskStatusStore([str(i) for i in range(10_000)])
+
+    assert store._codes.nbytes == 10_000
@@ -0,0 +1,67 @@
+import time
+from pathlib import Path
+from threading import Event, Thread
+
+from isar_robot.profiler import SamplingProfiler
+
+
+def _publish_telemetry(signal_stop: Event) -> None:
+    while not signal_stop.is_set():
+        time.sleep(0.001)
+
+
+def test_profiler_samples_robot_threads(tmp_path: Path) -> None:
+    signal_stop = Event()
+    robot_thread = Thread(
+        target=_publish_telemetry, args=[signal_stop], name="ISAR Robot Pose Publisher"
+    )
+    other_thread = Thread(
+        target=_publish_telemetry, args=[signal_stop], name="Unrelated thread"
+    )
+    robot_thread.start()
+    other_thread.start()
+
+    output_file = tmp_path / "profile.folded"
+    profiler = SamplingProfiler(
+        sample_interval=0.001, output_file=output_file, write_interval=1.0
+    )
+    profiler.start()
+    time.sleep(0.2)
+    profiler.stop()
+    signal_stop.set()
+    robot_thread.join()
+    other_thread.join()
+
+    lines = output_file.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("ISAR Robot Pose Publisher;")
+        assert "test_profiler:_publish_telemetry" in stack
+        assert int(count) > 0
+
+
+def test_profiler_groups_executor_threads() -> None:
+    profiler = SamplingProfiler(
+        sample_interval=1.0, output_file=Path("unused"), write_interval=1.0
+    )
+    signal_stop = Event()
+    threads = [
+        Thread(
+            target=_publish_telemetry,
+            args=[signal_stop],
+            name=f"Mission simulation thread_{i}",
+        )
+        for i in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+
+    profiler.sample()
+    signal_stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert sum(profiler.stack_counts.values()) == 2
+    for stack in profiler.stack_counts:
+        assert stack.startswith("Mission simulation thread;")
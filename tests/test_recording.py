@@ -0,0 +1,169 @@
+from pathlib import Path
+
+import numpy as np
+from robot_interface.models.mission.status import MissionStatus, TaskStatus
+
+from isar_robot.mission_state import mission_status_codes, task_status_codes
+from isar_robot.recording import (
+    ColumnarLog,
+    TelemetryRecorder,
+    battery_dtype,
+    load_recording,
+)
+
+
+def _create_log(directory: Path, **kwargs: int) -> ColumnarLog:
+    return ColumnarLog(
+        directory=directory,
+        name="battery",
+        dtype=battery_dtype,
+        batch_size=kwargs.get("batch_size", 4),
+        chunk_size=kwargs.get("chunk_size", 10),
+        max_chunks=kwargs.get("max_chunks", 0),
+    )
+
+
+def _load(directory: Path, name: str = "battery") -> np.ndarray:
+    chunks = load_recording(directory, name)
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=battery_dtype)
+
+
+def test_rows_are_written_in_batches(tmp_path: Path) -> None:
+    log = _create_log(tmp_path)
+    for i in range(3):
+        log.append(float(i + 1), 50.0)
+
+    assert len(_load(tmp_path)) == 0
+
+    log.append(4.0, 50.0)
+
+    assert list(_load(tmp_path)["timestamp"]) == [1, 2, 3, 4]
+
+
+def test_chunks_are_rotated_and_last_chunk_truncated(tmp_path: Path) -> None:
+    log = _create_log(tmp_path)
+    for i in range(25):
+        log.append(float(i + 1), float(i))
+    log.close()
+
+    chunk_paths = sorted(tmp_path.glob("battery-*.npy"))
+    assert [len(np.load(path)) for path in chunk_paths] == [10, 10, 5]
+    rows = _load(tmp_path)
+    assert list(rows["battery_level"]) == [float(i) for i in range(25)]
+
+
+def test_oldest_chunks_are_deleted(tmp_path: Path) -> None:
+    log = _create_log(tmp_path, max_chunks=2)
+    for i in range(35):
+        log.append(float(i + 1), float(i))
+    log.close()
+
+    chunk_paths = sorted(tmp_path.glob("battery-*.npy"))
+    assert [path.name for path in chunk_paths] == [
+        "battery-000002.npy",
+        "battery-000003.npy",
+    ]
+    assert _load(tmp_path)["battery_level"][0] == 20.0
+
+
+def test_flush_writes_partial_batch(tmp_path: Path) -> None:
+    log = _create_log(tmp_path)
+    log.append(1.0, 50.0)
+    log.flush()
+
+    assert len(_load(tmp_path)) == 1
+    log.close()
+    log.close()
+    assert len(_load(tmp_path)) == 1
+
+
+def test_empty_log_leaves_no_files(tmp_path: Path) -> None:
+    log = _create_log(tmp_path, batch_size=1)
+    log.close()
+
+    assert list(tmp_path.glob("battery-*.npy")) == []
+
+
+def test_recorder_records_mission_state_transitions(tmp_path: Path) -> None:
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=2, chunk_size=100, max_chunks=0
+    )
+    recorder.record_task_status("mission", 0, TaskStatus.InProgress)
+    recorder.record_task_status("mission", 0, TaskStatus.Successful)
+    recorder.record_mission_status("mission", MissionStatus.Successful)
+    recorder.record_pose(1.0, (1, 2, 3, 0, 0, 0, 1))
+    recorder.close()
+
+    task_statuses = _load(tmp_path, "task_status")
+    assert [task_status_codes[code] for code in task_statuses["status"]] == [
+        TaskStatus.InProgress,
+        TaskStatus.Successful,
+    ]
+    assert list(task_statuses["mission_id"]) == [b"mission", b"mission"]
+    mission_statuses = _load(tmp_path, "mission_status")
+    assert mission_status_codes[mission_statuses["status"][0]] == (
+        MissionStatus.Successful
+    )
+    assert _load(tmp_path, "pose")["z"][0] == 3.0
+
+
+def test_failed_writes_are_logged_and_recording_continues(
+    tmp_path: Path, monkeypatch
+) -> None:
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=1, chunk_size=100, max_chunks=0
+    )
+
+    def fail(*args, **kwargs) -> None:
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(np.lib.format, "open_memmap", fail)
+        recorder.record_battery_level(1.0, 50.0)
+    recorder.record_battery_level(2.0, 49.0)
+    recorder.close()
+
+    assert list(_load(tmp_path)["timestamp"]) == [2.0]
+
+
+def test_mission_ids_that_do_not_fit_are_not_recorded(tmp_path: Path) -> None:
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=1, chunk_size=100, max_chunks=0
+    )
+    recorder.record_mission_status("m" * 200, MissionStatus.InProgress)
+    recorder.record_mission_status("m" * 128, MissionStatus.Successful)
+    recorder.close()
+
+    assert list(_load(tmp_path, "mission_status")["mission_id"]) == [b"m" * 128]
+
+
+def test_restarted_recording_keeps_earlier_chunks(tmp_path: Path) -> None:
+    log = _create_log(tmp_path, max_chunks=2)
+    for i in range(15):
+        log.append(float(i + 1), float(i))
+    log.close()
+
+    restarted_log = _create_log(tmp_path, max_chunks=2)
+    for i in range(15, 25):
+        restarted_log.append(float(i + 1), float(i))
+    restarted_log.close()
+
+    chunk_paths = sorted(tmp_path.glob("battery-*.npy"))
+    assert [path.name for path in chunk_paths] == [
+        "battery-000001.npy",
+        "battery-000002.npy",
+    ]
+    assert list(_load(tmp_path)["battery_level"]) == [float(i) for i in range(10, 25)]
+
+
+def test_recording_is_loaded_as_memory_mapped_chunks(tmp_path: Path) -> None:
+    log = _create_log(tmp_path)
+    for i in range(12):
+        log.append(float(i + 1), float(i))
+    log.flush()
+
+    chunks = load_recording(tmp_path, "battery")
+
+    assert [len(chunk) for chunk in chunks] == [10, 2]
+    assert all(isinstance(chunk, np.memmap) for chunk in chunks)
+    log.close()
@@ -0,0 +1,104 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from isar_robot.config import reload
+from isar_robot.config.reload import (
+    SettingsWatcher,
+    add_settings_listener,
+    reload_settings,
+)
+from isar_robot.config.settings import settings
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    values = dict(settings.__dict__)
+    yield
+    settings.__dict__.update(values)
+
+
+class SettingsListener:
+    def __init__(self) -> None:
+        self.changes: list[dict[str, Any]] = []
+
+    def on_settings_reloaded(self, changed: dict[str, Any]) -> None:
+        self.changes.append(changed)
+
+
+def test_reload_settings_applies_changes_and_notifies_listeners() -> None:
+    listener = SettingsListener()
+    add_settings_listener(listener.on_settings_reloaded)
+
+    changed = reload_settings({"MISSION_SIMULATION_TASK_FAILURE_PROBABILITY": "0.5"})
+
+    assert changed == {"MISSION_SIMULATION_TASK_FAILURE_PROBABILITY": 0.5}
+    assert settings.MISSION_SIMULATION_TASK_FAILURE_PROBABILITY == 0.5
+    assert listener.changes == [changed]
+
+
+def test_invalid_reload_leaves_settings_unchanged() -> None:
+    with pytest.raises(ValidationError):
+        reload_settings(
+            {
+                "ROBOT_POSE_PUBLISH_INTERVAL": "0.5",
+                "MISSION_SIMULATION_TASK_DURATION": "not a number",
+            }
+        )
+
+    assert settings.ROBOT_POSE_PUBLISH_INTERVAL == 1
+
+
+def test_settings_watcher_reloads_changed_file(tmp_path: Path) -> None:
+    settings_file = tmp_path / "robot.env"
+    settings_file.write_text(
+        "ROBOT_ROBOT_POSE_PUBLISH_INTERVAL=0.5\n"
+        'ROBOT_BATTERY_SENSOR_DISCHARGE_RATES={"take_image": 1.0}\n'
+        "UNRELATED_VARIABLE=1\n"
+    )
+    watcher = SettingsWatcher(path=settings_file, interval=1.0)
+
+    changed = watcher.check()
+
+    assert changed == {
+        "ROBOT_POSE_PUBLISH_INTERVAL": 0.5,
+        "BATTERY_SENSOR_DISCHARGE_RATES": {"take_image": 1.0},
+    }
+    assert settings.ROBOT_POSE_PUBLISH_INTERVAL == 0.5
+    assert watcher.check() == {}
+
+
+def test_settings_watcher_ignores_unreadable_files(tmp_path: Path, monkeypatch) -> None:
+    settings_file = tmp_path / "robot.env"
+    settings_file.write_bytes(b"ROBOT_ROBOT_POSE_PUBLISH_INTERVAL=\xff\n")
+    watcher = SettingsWatcher(path=settings_file, interval=1.0)
+
+    assert watcher.check() == {}
+
+    settings_file.write_text("ROBOT_ROBOT_POSE_PUBLISH_INTERVAL=0.5\n")
+
+    def deny(*args, **kwargs) -> None:
+        raise PermissionError("permission denied")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(reload, "dotenv_values", deny)
+        assert watcher.check() == {}
+    assert watcher.check() == {"ROBOT_POSE_PUBLISH_INTERVAL": 0.5}
+
+
+class FailingSettingsListener:
+    def on_settings_reloaded(self, changed: dict[str, Any]) -> None:
+        raise FileNotFoundError("missing.json")
+
+
+def test_failing_listener_does_not_stop_other_listeners() -> None:
+    failing = FailingSettingsListener()
+    listener = SettingsListener()
+    add_settings_listener(failing.on_settings_reloaded)
+    add_settings_listener(listener.on_settings_reloaded)
+
+    changed = reload_settings({"MISSION_SIMULATION_TASK_FAILURE_PROBABILITY": "0.5"})
+
+    assert listener.changes == [changed]
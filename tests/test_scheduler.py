@@ -0,0 +1,197 @@
+import itertools
+import time
+from queue import Queue
+from threading import Event, Thread
+
+import pytest
+from robot_interface.telemetry.mqtt_client import MqttTelemetryPublisher
+
+from isar_robot.scheduler import (
+    TelemetryScheduler,
+    TimerWheel,
+    publish_telemetry,
+    run_publisher,
+)
+from tests.conftest import FakeClock
+
+
+def _create_publisher(queue: Queue, interval: float) -> MqttTelemetryPublisher:
+    return MqttTelemetryPublisher(
+        mqtt_queue=queue,
+        telemetry_method=lambda isar_id, robot_name: "payload",
+        topic="isar/isar_id/obstacle_status",
+        interval=interval,
+    )
+
+
+def _wait_for_publishes(scheduler: TelemetryScheduler, publishes: int) -> None:
+    deadline: float = time.monotonic() + 5
+    while scheduler.statistics.publishes < publishes:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_timer_wheel_returns_items_when_due() -> None:
+    wheel: TimerWheel = TimerWheel(tick=0.25, n_slots=4, start_time=0.0)
+    wheel.add("soon", deadline=0.6)
+    # More than one revolution ahead, in the same slot as "soon"
+    wheel.add("later", deadline=1.6)
+
+    assert wheel.advance(0.5) == []
+    assert wheel.advance(0.75) == ["soon"]
+    assert wheel.advance(1.5) == []
+    assert wheel.advance(1.75) == ["later"]
+    assert len(wheel) == 0
+
+
+def test_timer_wheel_catches_up_after_falling_behind() -> None:
+    wheel: TimerWheel = TimerWheel(tick=0.1, n_slots=4, start_time=0.0)
+    for i in range(10):
+        wheel.add(i, deadline=i * 0.1)
+
+    assert sorted(wheel.advance(5.0)) == list(range(10))
+
+
+def test_deadlines_do_not_drift() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1, clock=clock)
+    queue: Queue = Queue()
+    scheduled = scheduler.schedule(_create_publisher(queue, 1.0), "isar_id", "robot")
+    first_deadline: float = scheduled.deadline
+
+    for period in range(1, 6):
+        # Dispatch slightly late every period
+        clock.now = first_deadline + (period - 1) + 0.05
+        scheduler.dispatch_due()
+        _wait_for_publishes(scheduler, period)
+        assert scheduled.deadline == pytest.approx(first_deadline + period)
+
+    assert queue.qsize() == 5
+    assert scheduler.statistics.deadline_misses == 0
+    assert scheduler.statistics.max_lateness == pytest.approx(0.05)
+
+
+def test_phases_are_spread_over_the_interval() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1, clock=clock)
+    queue: Queue = Queue()
+    deadlines: list[float] = [
+        scheduler.schedule(_create_publisher(queue, 1.0), "isar_id", "robot").deadline
+        for _ in range(10)
+    ]
+
+    phases: list[float] = sorted(deadline - clock.now for deadline in deadlines)
+    gaps: list[float] = [b - a for a, b in itertools.pairwise(phases)]
+    assert 0 <= phases[0] and phases[-1] < 1.0
+    assert min(gaps) > 0.05
+
+
+def test_skipped_periods_are_counted_as_deadline_misses() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1, clock=clock)
+    queue: Queue = Queue()
+    scheduled = scheduler.schedule(_create_publisher(queue, 1.0), "isar_id", "robot")
+    first_deadline: float = scheduled.deadline
+
+    clock.now = first_deadline + 3.5
+    scheduler.dispatch_due()
+    _wait_for_publishes(scheduler, 1)
+
+    assert scheduler.statistics.deadline_misses == 3
+    assert scheduled.deadline == pytest.approx(first_deadline + 4)
+
+
+def test_slow_publisher_is_not_run_concurrently() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=2, clock=clock)
+    release = Event()
+    queue: Queue = Queue()
+    publisher = _create_publisher(queue, 1.0)
+    publisher.telemetry_method = lambda isar_id, robot_name: release.wait() and "slow"
+    scheduled = scheduler.schedule(publisher, "isar_id", "robot")
+
+    clock.now = scheduled.deadline + 0.02
+    scheduler.dispatch_due()
+    clock.now = scheduled.deadline + 0.02
+    scheduler.dispatch_due()
+    release.set()
+    _wait_for_publishes(scheduler, 1)
+
+    assert scheduler.statistics.deadline_misses == 1
+    assert queue.qsize() == 1
+
+
+def test_cancelled_publisher_is_dropped() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1, clock=clock)
+    queue: Queue = Queue()
+    scheduled = scheduler.schedule(_create_publisher(queue, 1.0), "isar_id", "robot")
+
+    scheduler.cancel(scheduled)
+    clock.now = scheduled.deadline + 0.5
+    scheduler.dispatch_due()
+
+    assert len(scheduler.wheel) == 0
+    assert queue.empty()
+
+
+def test_scheduler_publishes_at_interval_when_running() -> None:
+    scheduler = TelemetryScheduler(tick=0.005, n_slots=256, max_workers=2)
+    queue: Queue = Queue()
+    scheduler.start()
+    scheduler.schedule(_create_publisher(queue, 0.05), "isar_id", "robot")
+    time.sleep(0.52)
+    scheduler.stop()
+
+    assert 9 <= queue.qsize() <= 11
+
+
+def test_publisher_without_interval_is_rejected() -> None:
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1)
+
+    with pytest.raises(ValueError):
+        scheduler.schedule(_create_publisher(Queue(), 0), "isar_id", "robot")
+
+
+def test_failing_publisher_does_not_stop_the_scheduler() -> None:
+    clock = FakeClock(1000.0)
+    scheduler = TelemetryScheduler(tick=0.01, n_slots=256, max_workers=1, clock=clock)
+    queue: Queue = Queue()
+    failing_publisher = _create_publisher(queue, 1.0)
+    failing_publisher.telemetry_method = lambda isar_id, robot_name: 1 / 0
+    failing = scheduler.schedule(failing_publisher, "isar_id", "robot")
+
+    for period in range(1, 3):
+        clock.now = failing.deadline + 0.02
+        scheduler.dispatch_due()
+        _wait_for_publishes(scheduler, period)
+
+    assert not failing.running
+    assert len(scheduler.wheel) == 1
+
+
+def test_expiring_telemetry_is_published_with_expiry() -> None:
+    queue: Queue = Queue()
+    publisher = _create_publisher(queue, 1.0)
+    publisher.topic = "isar/isar_id/pose"
+
+    publish_telemetry(publisher, "isar_id", "robot")
+
+    topic, payload, _, _, properties = queue.get_nowait()
+    assert (topic, payload) == ("isar/isar_id/pose", "payload")
+    assert properties.MessageExpiryInterval > 0
+
+
+def test_threaded_publisher_returns_when_stopped() -> None:
+    queue: Queue = Queue()
+    signal_stop = Event()
+    thread = Thread(
+        target=run_publisher,
+        args=(_create_publisher(queue, 10.0), "isar_id", "robot", signal_stop),
+    )
+    thread.start()
+    signal_stop.set()
+    thread.join(timeout=1.0)
+
+    assert not thread.is_alive()
+    assert queue.qsize() == 1
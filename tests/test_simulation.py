@@ -0,0 +1,206 @@
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+from alitra import Frame, Orientation, Pose, Position
+from robot_interface.models.exceptions.robot_exceptions import RobotTaskStatusException
+from robot_interface.models.mission.mission import Mission
+from robot_interface.models.mission.status import MissionStatus, TaskStatus
+from robot_interface.models.mission.task import TakeImage
+
+from isar_robot.config.settings import settings
+from isar_robot.mission_state import (
+    TaskStatusStore,
+    mission_status_codes,
+    task_status_codes,
+)
+from isar_robot.recording import TelemetryRecorder, load_recording
+from isar_robot.simulation import MissionSimulation, create_simulation_executor
+
+robot_pose = Pose(
+    Position(0, 0, 0, Frame("asset")),
+    Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+    Frame("asset"),
+)
+target = Position(x=0, y=0, z=0, frame=Frame("robot"))
+
+
+def _create_mission(n_tasks: int) -> Mission:
+    return Mission(
+        name="Simulated mission",
+        tasks=[
+            TakeImage(id=str(i), target=target, robot_pose=robot_pose)
+            for i in range(n_tasks)
+        ],
+    )
+
+
+def test_missions_reuse_executor_thread(fast_simulation) -> None:
+    executor = create_simulation_executor()
+    thread_names: set[str] = set()
+
+    for _ in range(5):
+        simulation = MissionSimulation(_create_mission(n_tasks=2))
+        simulation.start(executor)
+        simulation.join()
+        thread_names.update(thread.name for thread in executor._threads)
+
+        assert simulation.mission_status() == MissionStatus.Successful
+
+    assert len(thread_names) == 1
+    executor.shutdown()
+
+
+def test_stopped_mission_frees_executor(fast_simulation) -> None:
+    executor = create_simulation_executor()
+
+    simulation = MissionSimulation(_create_mission(n_tasks=1000))
+    simulation.start(executor)
+    simulation.stop_mission()
+
+    assert not simulation.is_alive()
+    assert simulation.mission_done
+
+    next_simulation = MissionSimulation(_create_mission(n_tasks=1))
+    next_simulation.start(executor)
+    next_simulation.join()
+
+    assert next_simulation.mission_status() == MissionStatus.Successful
+    executor.shutdown()
+
+
+def test_task_models_are_released_after_inspection(fast_simulation) -> None:
+    executor = create_simulation_executor()
+    mission = _create_mission(n_tasks=3)
+
+    simulation = MissionSimulation(mission)
+    assert not hasattr(simulation, "mission")
+    simulation.start(executor)
+    simulation.join()
+
+    assert simulation.task_status("1") == TaskStatus.Successful
+    assert simulation.tasks[1] is mission.tasks[1]
+    simulation.release_task("1")
+    assert simulation.tasks == [mission.tasks[0], None, mission.tasks[2]]
+    executor.shutdown()
+
+
+def test_inspection_time_is_kept_until_the_task_is_released(fast_simulation) -> None:
+    executor = create_simulation_executor()
+    before: datetime = datetime.now(UTC)
+
+    simulation = MissionSimulation(_create_mission(n_tasks=2))
+    simulation.start(executor)
+    simulation.join()
+
+    inspection_time: datetime | None = simulation.inspection_time("1")
+    assert inspection_time is not None
+    assert before < inspection_time < datetime.now(UTC)
+    simulation.release_task("1")
+    assert simulation.inspection_time("1") is None
+    assert simulation.inspection_time("unknown") is None
+    executor.shutdown()
+
+
+def test_failed_task_models_are_released_when_finished(
+    fast_simulation, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "MISSION_SIMULATION_TASK_FAILURE_PROBABILITY", 1.0)
+    executor = create_simulation_executor()
+
+    simulation = MissionSimulation(_create_mission(n_tasks=3))
+    simulation.start(executor)
+    simulation.join()
+
+    assert simulation.mission_status() == MissionStatus.Failed
+    assert simulation.tasks == [None, None, None]
+    executor.shutdown()
+
+
+def test_unknown_task_id_raises() -> None:
+    simulation = MissionSimulation.__new__(MissionSimulation)
+    simulation.task_statuses = TaskStatusStore(["a", "b"])
+
+    with pytest.raises(RobotTaskStatusException):
+        simulation.task_status("c")
+
+
+def test_mission_state_transitions_are_recorded(fast_simulation, tmp_path) -> None:
+    executor = create_simulation_executor()
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=1, chunk_size=100, max_chunks=0
+    )
+
+    simulation = MissionSimulation(_create_mission(n_tasks=2), recorder=recorder)
+    simulation.start(executor)
+    simulation.join()
+    recorder.close()
+
+    task_statuses = np.concatenate(load_recording(tmp_path, "task_status"))
+    assert list(zip(task_statuses["task_index"], task_statuses["status"])) == [
+        (0, task_status_codes.index(TaskStatus.InProgress)),
+        (0, task_status_codes.index(TaskStatus.Successful)),
+        (1, task_status_codes.index(TaskStatus.InProgress)),
+        (1, task_status_codes.index(TaskStatus.Successful)),
+    ]
+    mission_statuses = np.concatenate(load_recording(tmp_path, "mission_status"))
+    assert list(mission_statuses["status"]) == [
+        mission_status_codes.index(MissionStatus.InProgress),
+        mission_status_codes.index(MissionStatus.Successful),
+    ]
+    executor.shutdown()
+
+
+def test_failing_mission_job_fails_the_mission(
+    fast_simulation, monkeypatch, tmp_path
+) -> None:
+    executor = create_simulation_executor()
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=1, chunk_size=100, max_chunks=0
+    )
+    simulation = MissionSimulation(_create_mission(n_tasks=2), recorder=recorder)
+
+    def fail(*args) -> None:
+        raise RuntimeError("simulation step failed")
+
+    monkeypatch.setattr(simulation, "_complete_task", fail)
+    simulation.start(executor)
+    simulation.join()
+    recorder.close()
+
+    assert simulation.mission_done
+    assert simulation.mission_status() == MissionStatus.Failed
+    task_statuses = np.concatenate(load_recording(tmp_path, "task_status"))
+    assert list(zip(task_statuses["task_index"], task_statuses["status"])) == [
+        (0, task_status_codes.index(TaskStatus.InProgress)),
+        (0, task_status_codes.index(TaskStatus.Failed)),
+        (1, task_status_codes.index(TaskStatus.Failed)),
+    ]
+    mission_statuses = np.concatenate(load_recording(tmp_path, "mission_status"))
+    assert list(mission_statuses["status"]) == [
+        mission_status_codes.index(MissionStatus.InProgress),
+        mission_status_codes.index(MissionStatus.Failed),
+    ]
+
+    next_simulation = MissionSimulation(_create_mission(n_tasks=1))
+    next_simulation.start(executor)
+    next_simulation.join()
+
+    assert next_simulation.mission_status() == MissionStatus.Successful
+    executor.shutdown()
+
+
+def test_queued_mission_is_stopped_without_waiting(fast_simulation) -> None:
+    executor = create_simulation_executor()
+    running = MissionSimulation(_create_mission(n_tasks=1000))
+    running.start(executor)
+
+    queued = MissionSimulation(_create_mission(n_tasks=1))
+    queued.start(executor)
+    queued.stop_mission()
+
+    assert queued.mission_done
+    assert not queued.is_alive()
+    assert queued.future.cancelled()
+    running.stop_mission()
+    executor.shutdown()
@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+# Packages that are slow to import and are only needed once a robot is created.
+# NumPy is not listed, as robot_interface already imports it through alitra
+DEFERRED_PACKAGES: list[str] = ["isar", "paho"]
+
+# Generous budget for the time importing the module adds to importing
+# robot_interface, which is a few milliseconds when the loading is deferred
+IMPORT_TIME_BUDGET: float = 0.5
+
+_measure_import = """
+import json, sys, time
+import robot_interface.robot_interface
+
+loaded_before = set(sys.modules)
+start = time.perf_counter()
+import isar_robot.robotinterface
+import_time = time.perf_counter() - start
+loaded_by_import = set(sys.modules) - loaded_before
+
+from isar_robot.config.settings import get_settings
+
+print(json.dumps({
+    "packages_loaded": sorted({name.split(".")[0] for name in loaded_by_import}),
+    "modules": sorted(name for name in sys.modules if name.startswith("isar_robot")),
+    "settings_built": get_settings.cache_info().currsize,
+    "import_time": import_time,
+}))
+"""
+
+
+def _import_robotinterface_in_subprocess() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _measure_import],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_robotinterface_is_lazy() -> None:
+    result = _import_robotinterface_in_subprocess()
+
+    assert "isar_robot.inspections" not in result["modules"]
+    assert "isar_robot.simulation" not in result["modules"]
+    assert "isar_robot.telemetry" not in result["modules"]
+    assert result["settings_built"] == 0
+
+
+def test_import_robotinterface_defers_slow_packages() -> None:
+    result = _import_robotinterface_in_subprocess()
+
+    for package in DEFERRED_PACKAGES:
+        assert package not in result["packages_loaded"]
+
+
+def test_import_robotinterface_time_is_within_budget() -> None:
+    result = _import_robotinterface_in_subprocess()
+
+    assert result["import_time"] < IMPORT_TIME_BUDGET
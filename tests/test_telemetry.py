@@ -1,3 +1,11 @@
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+from alitra import Frame, Position
+
+from isar_robot.recording import TelemetryRecorder, load_recording
 from isar_robot.telemetry import Telemetry, _get_pressure_level
 
 
@@ -15,3 +23,72 @@ def test_get_pressure_level() -> None:
         pressure_level: float = _get_pressure_level()
         assert pressure_level >= 0.011
         assert pressure_level <= 0.079
+
+
+def test_distance_moved_is_counted_once_by_the_battery_level() -> None:
+    telemetry = Telemetry()
+    target = Position(x=11, y=1, z=1, frame=Frame("asset"))
+
+    telemetry._get_pose(current_target=target)
+    telemetry._get_battery_level(is_home=False)
+    telemetry._get_pose(current_target=target)
+
+    assert telemetry.distance_moved == 9.9
+    assert telemetry.distance_moved_at_battery_update == 9.0
+
+
+def test_get_pose_at_returns_pose_at_capture_time() -> None:
+    telemetry = Telemetry()
+    target = Position(x=11, y=1, z=1, frame=Frame("asset"))
+    telemetry._get_pose(current_target=None)
+    time.sleep(0.01)
+    capture_time = datetime.now(UTC)
+    time.sleep(0.01)
+    telemetry._get_pose(current_target=target)
+
+    pose = telemetry.get_pose_at(capture_time)
+
+    assert 1 <= pose.position.x < telemetry.current_pose.position.x
+
+
+def test_captured_pose_is_not_changed_by_movement() -> None:
+    telemetry = Telemetry()
+    target = Position(x=11, y=1, z=1, frame=Frame("asset"))
+    captured_pose = telemetry.get_pose()
+
+    telemetry._get_pose(current_target=target)
+
+    assert captured_pose.position.x == 1
+    assert telemetry.get_pose().position.x == 10
+
+
+def test_pose_built_from_a_replaced_sample_is_not_served() -> None:
+    telemetry = Telemetry()
+    target = Position(x=11, y=1, z=1, frame=Frame("asset"))
+    replaced_sample = telemetry.current_pose_sample
+    telemetry._get_pose(current_target=target)
+    # A caller that read the sample before the move caches its pose after it
+    telemetry._current_pose = (replaced_sample, replaced_sample.to_pose())
+
+    assert telemetry.get_pose().position.x == 10
+    assert telemetry.get_pose() is telemetry.get_pose()
+
+
+def test_telemetry_samples_are_recorded(tmp_path: Path) -> None:
+    recorder = TelemetryRecorder(
+        directory=tmp_path, batch_size=8, chunk_size=100, max_chunks=0
+    )
+    telemetry = Telemetry(recorder=recorder)
+    target = Position(x=11, y=1, z=1, frame=Frame("asset"))
+
+    for _ in range(3):
+        telemetry._get_pose(current_target=target)
+        telemetry._get_battery_level(is_home=False)
+    telemetry.get_pressure_telemetry(isar_id="isar_id", robot_name="robot")
+    recorder.close()
+
+    poses = np.concatenate(load_recording(tmp_path, "pose"))
+    assert len(poses) == 3
+    assert poses["x"][-1] == telemetry.current_pose_sample.x
+    assert len(np.concatenate(load_recording(tmp_path, "battery"))) == 3
+    assert len(np.concatenate(load_recording(tmp_path, "pressure"))) == 1